@@ -23,28 +23,28 @@ Features:
     - A button processes all CVs in the background (queue_job) to create new applicants.
     - Notifies the user on start and completion.
 
-This module depends on 'hr_recruitment_skills' to create and link skills
-from the extracted data.
+If 'hr_recruitment_skills' is installed, the extracted skills are also
+created and linked to the applicants. Without it, only the simple fields
+(name, email, phone, LinkedIn, degree) are filled in.
     """,
     'author': 'jito-dev (Ported by Odoo 17 Expert)',
     'website': 'https://jito.dev',
     'depends': [
         'hr_recruitment',
         'mail',
-        'hr_recruitment_skills', # Required for skill processing
         'queue_job',             # For background processing
         'bus',                   # For user notifications
     ],
     'data': [
         'security/ir.model.access.csv',
+        'data/queue_job_channel.xml',
         'views/hr_applicant_views.xml',
         'views/res_config_settings_views.xml',
         'views/hr_job_views.xml',
     ],
-    'assets': {},
     'external_dependencies': {
         'python': [
-            'google.generativeai',
+            'google-generativeai>=0.8',
         ],
     },
     'license': 'LGPL-3',
@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 from . import res_company
 from . import res_config_settings
+from . import hr_applicant_gemini_cache
 from . import hr_applicant
 from . import hr_job
\ No newline at end of file
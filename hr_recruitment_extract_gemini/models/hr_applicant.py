@@ -1,16 +1,50 @@
 # -*- coding: utf-8 -*-
-import base64
+import asyncio
+import functools
 import google.generativeai as genai
+import io
 import json
 import logging
 import odoo
 import re
-
-from odoo import api, fields, models, _
+import threading
+import time
+
+from collections import defaultdict
+from google.api_core import exceptions as google_exceptions
+from google.generativeai import client as genai_client
+from google.generativeai.types import file_types
+from odoo import api, fields, models, tools, _
 from odoo.exceptions import UserError
+from odoo.osv import expression
 
 _logger = logging.getLogger(__name__)
 
+try:
+    import pymupdf
+    import pymupdf4llm
+except ImportError:
+    _logger.debug("pymupdf4llm is not installed: PDF CVs will not be converted to Markdown.")
+    pymupdf4llm = None
+
+try:
+    import json_repair
+except ImportError:
+    _logger.debug("json_repair is not installed: malformed Gemini responses will not be repaired.")
+    json_repair = None
+
+try:
+    import orjson
+except ImportError:
+    _logger.debug("orjson is not installed: Gemini responses will be parsed with json.")
+    orjson = None
+
+try:
+    import pdfplumber
+except ImportError:
+    _logger.debug("pdfplumber is not installed: PDF CVs will be sent to Gemini as files.")
+    pdfplumber = None
+
 # This prompt instructs the Gemini model to act as an HR assistant
 # and extract specific fields from a CV file, returning them in a
 # structured JSON format.
@@ -30,25 +64,237 @@ Extract the following fields from the file:
   - "level": The proficiency level (e.g., "Beginner (15%)", "Elementary (25%)", "Intermediate (50%)", "Advanced (80%)", "Expert (100%)").
 
 RULES:
-1.  Return ONLY a valid JSON object.
-2.  Do not include any text before or after the JSON (e.g., no "Here is the JSON..." or markdown backticks).
-3.  If a value is not found, return `null` for that field, except for the "skills" field.
-4.  For the "skills" field, if a level is not specified, return "Beginner (15%)".
-5.  The "skills" field must be a list of objects, like:
+1.  If a value is not found, return `null` for that field, except for the "skills" field.
+2.  For the "skills" field, if a level is not specified, return "Beginner (15%)".
+3.  The "skills" field must be a list of objects, like:
     "skills": [
       { "type": "Programming Languages", "skill": "Python", "level": "Advanced (80%)" },
       { "type": "Languages", "skill": "English", "level": "C1 (85%)" }
     ]
-6. Skill levels for different type:
+4. Skill levels for different type:
   - "Programming Languages": "Beginner (15%)", "Elementary (25%)", "Intermediate (50%)", "Advanced (80%)", "Expert (100%)";
   - "Languages": "C2 (100%)", "C1 (85%)", "B2 (75%)", "B1 (60%)", "A2 (40%)", "A1 (10%)";
   - "IT": "Beginner (15%)", "Elementary (25%)", "Intermediate (50%)", "Advanced (80%)", "Expert (100%)";
   - "Soft Skills": "Beginner (15%)", "Elementary (25%)", "Intermediate (50%)", "Advanced (80%)", "Expert (100%)";
   - "Marketing": (L4 (100%), L3 (75%), L2 (50%), L1 (25%)).
-
-You must return the data in JSON format.
 """
 
+# Bump whenever the prompt changes so that cached extraction
+# results produced by an older prompt are not reused.
+GEMINI_CV_EXTRACTION_PROMPT_VERSION = '2'
+
+# Structured output: Gemini returns JSON matching this schema, so the
+# prompt no longer has to ask for bare JSON without markdown fences.
+_GEMINI_NULLABLE_STRING = genai.protos.Schema(type=genai.protos.Type.STRING, nullable=True)
+GEMINI_CV_RESPONSE_SCHEMA = genai.protos.Schema(
+    type=genai.protos.Type.OBJECT,
+    properties={
+        'name': _GEMINI_NULLABLE_STRING,
+        'email': _GEMINI_NULLABLE_STRING,
+        'phone': _GEMINI_NULLABLE_STRING,
+        'linkedin': _GEMINI_NULLABLE_STRING,
+        'degree': _GEMINI_NULLABLE_STRING,
+        'skills': genai.protos.Schema(
+            type=genai.protos.Type.ARRAY,
+            items=genai.protos.Schema(
+                type=genai.protos.Type.OBJECT,
+                properties={
+                    'type': genai.protos.Schema(type=genai.protos.Type.STRING),
+                    'skill': genai.protos.Schema(type=genai.protos.Type.STRING),
+                    'level': genai.protos.Schema(type=genai.protos.Type.STRING),
+                },
+                required=['type', 'skill', 'level'],
+            ),
+        ),
+    },
+    required=['skills'],
+)
+GEMINI_CV_GENERATION_CONFIG = {
+    'response_mime_type': 'application/json',
+    'response_schema': GEMINI_CV_RESPONSE_SCHEMA,
+}
+
+# queue_job channel of all Gemini jobs, declared in data/queue_job_channel.xml.
+# Single extractions are prioritized over chunks and bulk CV imports
+# (a lower priority runs first).
+GEMINI_QUEUE_JOB_CHANNEL = 'root.gemini'
+GEMINI_EXTRACTION_JOB_PRIORITY = 10
+GEMINI_BATCH_EXTRACTION_JOB_PRIORITY = 20
+GEMINI_BULK_CV_JOB_PRIORITY = 30
+
+# Number of applicants processed by a single queue job when the
+# extraction is launched on several applicants at once.
+GEMINI_EXTRACTION_BATCH_SIZE = 20
+
+# PDFs whose text layer is shorter than this (e.g. scanned CVs) are
+# sent to Gemini as files instead of as extracted text.
+GEMINI_MIN_CV_TEXT_LENGTH = 200
+
+# Skill level given to extracted skills whose level is missing or unknown.
+GEMINI_DEFAULT_SKILL_LEVEL_NAME = 'Beginner'
+GEMINI_DEFAULT_SKILL_LEVEL_PROGRESS = 15
+
+# Default maximum number of concurrent Gemini calls within a batch job,
+# kept within the Gemini API rate limits. It can be changed with the
+# 'gemini.cv.concurrency' system parameter.
+GEMINI_MAX_CONCURRENT_CALLS = 8
+
+# CV files sent as files (not as extracted text) above this size are uploaded
+# through the Gemini File API and referenced by URI instead of being inlined
+# in every request. Uploaded files expire after 48 hours on Gemini's side,
+# so they are reused for a shorter time.
+GEMINI_FILE_API_MIN_SIZE = 512 * 1024
+GEMINI_FILE_API_REUSE_SECONDS = 24 * 3600
+GEMINI_FILE_API_CACHE_SIZE = 256
+
+# Rate-limited (429) and server-side (5xx) errors are retried with an
+# exponential backoff of 2, 4, then 8 seconds.
+GEMINI_MAX_RETRIES = 3
+_GEMINI_RETRYABLE_ERRORS = (
+    google_exceptions.TooManyRequests,
+    google_exceptions.InternalServerError,
+    google_exceptions.BadGateway,
+    google_exceptions.ServiceUnavailable,
+    google_exceptions.GatewayTimeout,
+)
+
+# Precompiled patterns used when parsing Gemini responses
+_JSON_FENCE_RE = re.compile(r"```json\n(.*?)\n```", re.DOTALL)
+_JSON_OBJECT_RE = re.compile(r"\{.*\}", re.DOTALL)
+_LINKEDIN_URL_RE = re.compile(r'(https?://[^\s)\]]+)')
+# Skill level in the "Name (Progress%)" format, e.g. "Advanced (80%)"
+_SKILL_LEVEL_RE = re.compile(r"(.+?)\s*\((\d+)%\)")
+
+# Keys of GEMINI_CV_RESPONSE_SCHEMA holding a nullable string
+_GEMINI_CV_STRING_KEYS = ('name', 'email', 'phone', 'linkedin', 'degree')
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so both
+# raise the same error on invalid input.
+_json_loads = orjson.loads if orjson else json.loads
+
+def _gemini_is_cv_data(data):
+    """
+    Returns whether `data` has the shape of GEMINI_CV_RESPONSE_SCHEMA:
+    a `skills` list, and strings (or nulls) for the other keys.
+    """
+    return (
+        isinstance(data, dict)
+        and isinstance(data.get('skills'), list)
+        and all(isinstance(data.get(key), (str, type(None))) for key in _GEMINI_CV_STRING_KEYS)
+    )
+
+
+# `genai.configure` mutates global SDK state, so it is serialized.
+_gemini_configure_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=8)
+def _get_gemini_model(api_key, model_name):
+    """
+    Returns a `GenerativeModel` for the given API key and model name.
+    Models are cached per worker process, so the SDK is configured (and its
+    HTTP transport created) only once per pair instead of once per job.
+    The generation config is bound to the model, so each request only adds
+    its contents to this prebuilt template.
+    """
+    with _gemini_configure_lock:
+        genai.configure(api_key=api_key)
+        model = genai.GenerativeModel(model_name, generation_config=GEMINI_CV_GENERATION_CONFIG)
+        # The model otherwise binds the default client on its first call,
+        # outside of the lock, with whichever API key was configured last.
+        model._client = genai_client.get_default_generative_client()
+        return model
+
+
+@functools.lru_cache(maxsize=8)
+def _get_gemini_file_client(api_key):
+    """
+    Returns a File API client bound to the given API key, cached per worker
+    process like the models. Only taking the client needs the lock: the
+    uploads made with it use its own key, whichever key is configured later.
+    """
+    with _gemini_configure_lock:
+        genai.configure(api_key=api_key)
+        return genai_client.get_default_file_client()
+
+
+# (api_key, checksum) -> (uploaded file, upload time), so that retries of
+# the same CV within a worker reuse the uploaded file. At most
+# GEMINI_FILE_API_CACHE_SIZE files are kept, the oldest being dropped first.
+_gemini_uploaded_files = {}
+_gemini_uploaded_files_lock = threading.Lock()
+
+
+def _gemini_upload_file(api_key, checksum, cv_bytes, mime_type, display_name):
+    """
+    Uploads a CV file through the Gemini File API, or returns the file
+    already uploaded for the same content.
+    """
+    key = (api_key, checksum)
+    with _gemini_uploaded_files_lock:
+        uploaded = _gemini_uploaded_files.get(key)
+        if uploaded and time.time() - uploaded[1] < GEMINI_FILE_API_REUSE_SECONDS:
+            return uploaded[0]
+
+    # The upload itself runs outside of the locks, so that it does not block
+    # the other threads of the worker.
+    response = _get_gemini_file_client(api_key).create_file(
+        io.BytesIO(cv_bytes), mime_type=mime_type, display_name=display_name
+    )
+    uploaded_file = file_types.File(response)
+
+    now = time.time()
+    with _gemini_uploaded_files_lock:
+        for expired_key in [
+            uploaded_key for uploaded_key, (_file, uploaded_at) in _gemini_uploaded_files.items()
+            if now - uploaded_at >= GEMINI_FILE_API_REUSE_SECONDS
+        ]:
+            del _gemini_uploaded_files[expired_key]
+        _gemini_uploaded_files.pop(key, None)
+        # Entries are kept in upload order, so the first one is the oldest
+        while len(_gemini_uploaded_files) >= GEMINI_FILE_API_CACHE_SIZE:
+            del _gemini_uploaded_files[next(iter(_gemini_uploaded_files))]
+        _gemini_uploaded_files[key] = (uploaded_file, now)
+    return uploaded_file
+
+
+def _gemini_generate(model, contents):
+    """
+    Calls Gemini and returns the text of its response, retrying transient
+    errors. This only does network I/O, no ORM access, so it can run
+    outside the job's thread.
+    """
+    for attempt in range(GEMINI_MAX_RETRIES + 1):
+        try:
+            return model.generate_content(contents).text
+        except _GEMINI_RETRYABLE_ERRORS as e:
+            if attempt == GEMINI_MAX_RETRIES:
+                raise
+            delay = 2 ** (attempt + 1)
+            _logger.warning("Gemini call failed (%s), retrying in %s seconds.", str(e), delay)
+            time.sleep(delay)
+
+
+async def _gemini_generate_all(calls, max_concurrency=GEMINI_MAX_CONCURRENT_CALLS):
+    """
+    Runs the `(model, contents)` Gemini calls concurrently, at most
+    `max_concurrency` at a time.
+
+    Returns:
+        list: The response text, or the raised exception, of each call,
+              in the order of `calls`.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def generate(model, contents):
+        async with semaphore:
+            return await asyncio.to_thread(_gemini_generate, model, contents)
+
+    return await asyncio.gather(
+        *(generate(model, contents) for model, contents in calls),
+        return_exceptions=True,
+    )
+
 
 class HrApplicant(models.Model):
     """
@@ -104,10 +350,16 @@ class HrApplicant(models.Model):
     def _compute_can_extract_with_gemini(self):
         """
         Computes the visibility of the 'Extract with Gemini' button.
+        The extract mode is read once per company, not once per applicant.
         """
+        companies = self.company_id | self.env.company
+        manual_company_ids = {
+            company.id for company in companies
+            if company.gemini_cv_extract_mode == 'manual_send'
+        }
         for applicant in self:
-            company = applicant.company_id or self.env.company
-            is_manual_mode = company.gemini_cv_extract_mode == 'manual_send'
+            company_id = applicant.company_id.id or self.env.company.id
+            is_manual_mode = company_id in manual_company_ids
             # Allow extraction if not started, failed, or to re-run
             can_retry = applicant.gemini_extract_state in ('no_extract', 'error', 'done')
 
@@ -132,11 +384,28 @@ class HrApplicant(models.Model):
             'gemini_extract_status': _('Pending: Queued for extraction...'),
         })
 
-        # Call the job queue for each applicant
+        # Call the job queue, one job per chunk of applicants
         # Pass the user ID to notify the correct user
         user_id = self.env.user.id
-        for applicant in applicants_to_process:
-            applicant.with_delay()._run_gemini_extraction_job(user_id)
+        if len(applicants_to_process) == 1:
+            applicants_to_process.with_delay(
+                channel=GEMINI_QUEUE_JOB_CHANNEL,
+                priority=GEMINI_EXTRACTION_JOB_PRIORITY,
+                description=_("Gemini CV extraction: %s", applicants_to_process.name),
+            )._run_gemini_extraction_job(user_id)
+        else:
+            # Keep applicants sharing the same CV in the same chunk, so the
+            # batch job sends that CV to Gemini only once.
+            applicants_to_process = applicants_to_process.sorted(
+                lambda a: a.message_main_attachment_id.checksum or ''
+            )
+            for start in range(0, len(applicants_to_process), GEMINI_EXTRACTION_BATCH_SIZE):
+                batch = applicants_to_process[start:start + GEMINI_EXTRACTION_BATCH_SIZE]
+                batch.with_delay(
+                    channel=GEMINI_QUEUE_JOB_CHANNEL,
+                    priority=GEMINI_BATCH_EXTRACTION_JOB_PRIORITY,
+                    description=_("Gemini CV extraction: %s applicants", len(batch)),
+                )._run_gemini_batch_extraction_job(user_id)
 
         # Return a toast notification to the user
         return {
@@ -150,8 +419,20 @@ class HrApplicant(models.Model):
             }
         }
 
-    def _notify_user(self, user_id, params):
-        """Helper to send a notification to a specific user."""
+    def _notify_user(self, user_id, params, new_cursor=True):
+        """
+        Helper to send a notification to a specific user.
+
+        With `new_cursor=False` the notification is sent within the job's
+        own transaction and delivered when queue_job commits it, which
+        avoids opening and committing an extra transaction. Use it only when
+        the job's transaction is not rolled back afterwards.
+        """
+        if not new_cursor:
+            user = self.env['res.users'].browse(user_id)
+            if user.partner_id:
+                self.env['bus.bus']._sendone(user.partner_id, 'simple_notification', params)
+            return
         try:
             # Use a new cursor to ensure notification is sent
             # even if the main transaction is rolled back.
@@ -186,22 +467,18 @@ class HrApplicant(models.Model):
                     'gemini_extract_status': _('Processing: Calling Gemini API...'),
                 })
 
-                # 2. Call API (Reusable @api.model method)
-                response_text = self.env['hr.applicant']._gemini_call_for_cv(applicant.message_main_attachment_id)
-
-                # 3. Parse Response (Reusable @api.model method)
-                applicant.write({
-                    'gemini_extract_status': _('Processing: Parsing response...'),
-                })
-                extracted_data = self.env['hr.applicant']._parse_gemini_response(
-                    response_text,
+                # 2-3. Call API and parse the response, or reuse a cached
+                # result for an identical CV (Reusable @api.model method)
+                extracted_data = self.env['hr.applicant']._gemini_extract_cv_data(
+                    applicant.message_main_attachment_id,
                     record_id=f"applicant_{applicant.id}"
                 )
-                _logger.info(
-                    "Parsed Data for Applicant %s: \n%s",
-                    applicant.id,
-                    json.dumps(extracted_data, indent=2)
-                )
+                if _logger.isEnabledFor(logging.INFO):
+                    _logger.info(
+                        "Parsed Data for Applicant %s: \n%s",
+                        applicant.id,
+                        json.dumps(extracted_data, indent=2)
+                    )
 
                 # 4. Write all data (Reusable INSTANCE method)
                 skill_status_message = applicant._process_extracted_cv_data(extracted_data)
@@ -255,8 +532,122 @@ class HrApplicant(models.Model):
                     }
 
             if params:
-                # Send the success or failure notification
-                self._notify_user(user_id, params)
+                # Send the success or failure notification. On success the
+                # job's own transaction is committed by queue_job.
+                self._notify_user(user_id, params, new_cursor=not success)
+
+    def _run_gemini_batch_extraction_job(self, user_id):
+        """
+        This method runs in the background via the Odoo job queue.
+        It processes the extraction for a chunk of applicants in a single job
+        and notifies the user once at the end.
+
+        The Gemini calls of the chunk run concurrently. Everything touching
+        the database (reading the CVs, the cache and writing the results)
+        stays in the job's thread, as the ORM is not thread-safe.
+        State updates are written once per resulting status instead of once
+        per applicant.
+        """
+        applicants = self.exists()
+        applicants.write({
+            'gemini_extract_state': 'processing',
+            'gemini_extract_status': _('Processing: Calling Gemini API...'),
+        })
+
+        done_ids_by_status = defaultdict(list)
+        error_ids_by_status = defaultdict(list)
+        errors = []
+
+        def add_error(applicant, error):
+            _logger.error(
+                "Gemini extraction for applicant %s failed: %s",
+                applicant.id,
+                str(error),
+                exc_info=error
+            )
+            error_ids_by_status[_("Error: %s", str(error))].append(applicant.id)
+            errors.append(f"{applicant.name}: {str(error)}")
+
+        try:
+            # Anything failing outside of the applicants' own savepoints
+            # rolls back the whole chunk, which is then marked as failed.
+            with self.env.cr.savepoint():
+                # 1-2. Extract all CVs of the chunk at once
+                attachments = applicants.message_main_attachment_id
+                extracted_by_attachment = self._gemini_extract_cvs_data(attachments)
+
+                extracted_data_by_applicant = {}
+                for applicant in applicants:
+                    if not applicant.message_main_attachment_id:
+                        add_error(applicant, UserError(_("No attachment provided.")))
+                        continue
+                    result = extracted_by_attachment[applicant.message_main_attachment_id.id]
+                    if isinstance(result, Exception):
+                        add_error(applicant, result)
+                    else:
+                        extracted_data_by_applicant[applicant] = result
+
+                # 3. Write the extracted data of each applicant
+                for applicant in applicants.filtered(lambda a: a in extracted_data_by_applicant):
+                    extracted_data = extracted_data_by_applicant[applicant]
+                    try:
+                        # Use a savepoint per applicant to isolate failures
+                        with self.env.cr.savepoint():
+                            if _logger.isEnabledFor(logging.INFO):
+                                _logger.info(
+                                    "Parsed Data for Applicant %s: \n%s",
+                                    applicant.id,
+                                    json.dumps(extracted_data, indent=2)
+                                )
+                            skill_status_message = applicant._process_extracted_cv_data(extracted_data)
+                        done_ids_by_status[skill_status_message].append(applicant.id)
+
+                    except Exception as e:
+                        add_error(applicant, e)
+
+                for status, applicant_ids in done_ids_by_status.items():
+                    self.browse(applicant_ids).write({
+                        'gemini_extract_state': 'done',
+                        'gemini_extract_status': status,
+                    })
+                for status, applicant_ids in error_ids_by_status.items():
+                    self.browse(applicant_ids).write({
+                        'gemini_extract_state': 'error',
+                        'gemini_extract_status': status,
+                    })
+
+        except Exception as e:
+            _logger.error("Critical error during the Gemini batch extraction: %s", str(e), exc_info=True)
+            done_ids_by_status.clear()
+            errors.append(_("Critical Job Failure: %s", str(e)))
+            try:
+                applicants.write({
+                    'gemini_extract_state': 'error',
+                    'gemini_extract_status': _("Error: %s", str(e)),
+                })
+            except Exception as e_state:
+                _logger.error(
+                    "Failed to write the error state of applicants %s: %s",
+                    applicants.ids, str(e_state), exc_info=True
+                )
+
+        finally:
+            # Send a single notification for the whole chunk; only the
+            # single-applicant job notifies per applicant.
+            success_count = sum(len(applicant_ids) for applicant_ids in done_ids_by_status.values())
+            message = _("Gemini CV extraction finished.\nProcessed %s CVs: %s extracted, %s failed.",
+                        len(applicants), success_count, len(applicants) - success_count)
+            if errors:
+                message += _("\nErrors:\n- ") + "\n- ".join(errors)
+
+            # Failures were rolled back to their savepoints, so the job's own
+            # transaction is committed and carries the notification.
+            self._notify_user(user_id, {
+                'title': _('Processing Complete') if not errors else _('Processing Finished with Errors'),
+                'message': message,
+                'type': 'success' if not errors else 'warning',
+                'sticky': bool(errors),
+            }, new_cursor=False)
 
     # --- Reusable @api.model methods for API logic ---
 
@@ -283,9 +674,13 @@ class HrApplicant(models.Model):
         return api_key, model_name
 
     @api.model
-    def _gemini_call_for_cv(self, attachment):
+    def _gemini_prepare_cv_call(self, attachment):
         """
-        Reusable method to call the Gemini API for a single CV attachment.
+        Reads the configuration and the CV content needed to call Gemini
+        for a single CV attachment.
+
+        Returns:
+            tuple: The `GenerativeModel` and the contents to send to it.
         """
         # 1. Get client and config
         company = attachment.company_id or self.env.company
@@ -294,29 +689,46 @@ class HrApplicant(models.Model):
         # 2. Validate attachment
         if not attachment:
             raise UserError(_("No attachment provided."))
-        if not attachment.datas:
+        # Read the raw bytes from the filestore; going through `datas`
+        # would base64-encode the file only to decode it again.
+        cv_bytes = attachment.raw
+        if not cv_bytes:
             raise UserError(_("Attached CV is empty: %s", attachment.name))
 
-        _logger.info("Starting Gemini call for attachment: %s", attachment.name)
-
         # 3. Prepare data for API
-        # Decode base64 data from Odoo to raw bytes for the API
-        cv_blob = {
-            'mime_type': attachment.mimetype,
-            'data': base64.b64decode(attachment.datas)
-        }
+        # Send the text of PDFs rather than the file itself: it is much
+        # smaller on the wire and costs fewer input tokens.
+        cv_part = None
+        if attachment.mimetype == 'application/pdf':
+            cv_part = self._extract_text_from_pdf(cv_bytes)
+        if not cv_part and len(cv_bytes) > GEMINI_FILE_API_MIN_SIZE and attachment.checksum:
+            # Large files (e.g. scanned CVs) are referenced by URI
+            try:
+                cv_part = _gemini_upload_file(
+                    api_key, attachment.checksum, cv_bytes, attachment.mimetype, attachment.name
+                )
+            except Exception as e:
+                _logger.warning("Failed to upload CV %s to Gemini, sending it inline: %s", attachment.name, str(e))
+        if not cv_part:
+            cv_part = {
+                'mime_type': attachment.mimetype,
+                'data': cv_bytes,
+            }
 
-        # 4. Configure and call the Gemini API
-        try:
-            genai.configure(api_key=api_key)
-            model = genai.GenerativeModel(model_name)
-            prompt = GEMINI_CV_EXTRACTION_PROMPT_FILE
-            
-            _logger.info("Calling Gemini model '%s' for attachment %s", model_name, attachment.name)
-            response = model.generate_content([prompt, cv_blob])
-            
-            response_text = response.text
+        _logger.info("Calling Gemini model '%s' for attachment %s", model_name, attachment.name)
+        return _get_gemini_model(api_key, model_name), [GEMINI_CV_EXTRACTION_PROMPT_FILE, cv_part]
+
+    @api.model
+    def _gemini_call_for_cv(self, attachment):
+        """
+        Reusable method to call the Gemini API for a single CV attachment.
+        """
+        _logger.info("Starting Gemini call for attachment: %s", attachment.name)
+        model, contents = self._gemini_prepare_cv_call(attachment)
 
+        # 4. Call the Gemini API
+        try:
+            response_text = _gemini_generate(model, contents)
         except Exception as e:
             _logger.error("Gemini API call failed: %s", str(e), exc_info=True)
             raise UserError(_("Gemini API call failed: %s", str(e)))
@@ -328,27 +740,188 @@ class HrApplicant(models.Model):
         )
         return response_text
 
+    @api.model
+    def _extract_text_from_pdf(self, cv_bytes):
+        """
+        Extracts the text of a PDF CV locally.
+
+        With pymupdf4llm the text is returned as Markdown, which keeps the
+        headings and bullet lists of the CV in fewer tokens than plain text.
+        Otherwise pdfplumber's plain text is used, pages separated by form feeds.
+
+        Returns:
+            str: The CV text, or None if it could not be extracted or is too
+                 short to be usable (e.g. a scanned CV), in which case the
+                 file itself should be sent.
+        """
+        if not (pymupdf4llm or pdfplumber) or not cv_bytes.startswith(b'%PDF'):
+            return None
+        try:
+            if pymupdf4llm:
+                with pymupdf.open(stream=cv_bytes, filetype='pdf') as doc:
+                    cv_text = pymupdf4llm.to_markdown(doc).strip()
+            else:
+                with pdfplumber.open(io.BytesIO(cv_bytes)) as pdf:
+                    cv_text = '\f'.join(page.extract_text() or '' for page in pdf.pages).strip()
+        except Exception as e:
+            _logger.warning("Failed to extract text from PDF CV, sending the file instead: %s", str(e))
+            return None
+        if len(cv_text) < GEMINI_MIN_CV_TEXT_LENGTH:
+            return None
+        return cv_text
+
+    @api.model
+    def _gemini_extract_cv_data(self, attachment, record_id=None):
+        """
+        Reusable method returning the parsed extraction data for a CV attachment.
+
+        Results are cached by the attachment checksum (the SHA-1 of the
+        content, already computed by Odoo), the Gemini model and the prompt
+        version, so a CV that was already extracted is neither read from the
+        filestore nor sent to the Gemini API again.
+        """
+        extracted_data = self._gemini_get_cached_cv_data(attachment, record_id=record_id)
+        if extracted_data:
+            return extracted_data
+
+        response_text = self._gemini_call_for_cv(attachment)
+        return self._gemini_parse_cv_response(attachment, response_text, record_id=record_id)
+
+    @api.model
+    def _gemini_extract_cvs_data(self, attachments):
+        """
+        Batch counterpart of `_gemini_extract_cv_data`, for several CVs.
+
+        Cached CVs are served from the cache. The others are sent to Gemini
+        concurrently, CVs sharing the same checksum, API key and model with a
+        single call: CVs of companies configured differently are extracted
+        with their own settings.
+        Only the Gemini calls leave the current thread: reading the CVs and
+        the cache stays here, as the ORM is not thread-safe.
+
+        Returns:
+            dict: attachment id -> extracted data, or the exception raised
+                  while extracting that CV.
+        """
+        results = {}
+        # 1. Serve cached CVs and prepare the Gemini calls for the others
+        pending_calls = []
+        # (checksum, API key, model) -> attachments extracted by one call
+        pending_attachments_by_key = {}
+        for attachment in attachments:
+            log_id = f"attachment_{attachment.id}"
+            try:
+                extracted_data = self._gemini_get_cached_cv_data(attachment, record_id=log_id)
+                if extracted_data:
+                    results[attachment.id] = extracted_data
+                    continue
+                company = attachment.company_id or self.env.company
+                call_key = (attachment.checksum, *self._gemini_get_config(company.id))
+                if attachment.checksum and call_key in pending_attachments_by_key:
+                    pending_attachments_by_key[call_key].append(attachment)
+                else:
+                    call_attachments = [attachment]
+                    if attachment.checksum:
+                        pending_attachments_by_key[call_key] = call_attachments
+                    pending_calls.append((call_attachments, self._gemini_prepare_cv_call(attachment)))
+            except Exception as e:
+                results[attachment.id] = e
+
+        if not pending_calls:
+            return results
+
+        # 2. Call Gemini concurrently; responses keep the order of the calls
+        max_concurrency = int(self.env['ir.config_parameter'].sudo().get_param(
+            'gemini.cv.concurrency', GEMINI_MAX_CONCURRENT_CALLS
+        ))
+        responses = asyncio.run(_gemini_generate_all(
+            [call for _attachments, call in pending_calls], max_concurrency=max(max_concurrency, 1)
+        ))
+        for (call_attachments, _call), response in zip(pending_calls, responses):
+            try:
+                if isinstance(response, Exception):
+                    raise UserError(_("Gemini API call failed: %s", str(response)))
+                extracted_data = self._gemini_parse_cv_response(
+                    call_attachments[0], response, record_id=f"attachment_{call_attachments[0].id}"
+                )
+            except Exception as e:
+                extracted_data = e
+            for attachment in call_attachments:
+                results[attachment.id] = extracted_data
+        return results
+
+    @api.model
+    def _gemini_get_cached_cv_data(self, attachment, record_id=None):
+        """
+        Returns:
+            dict: The cached extraction data of the CV attachment, or None.
+        """
+        if not attachment:
+            raise UserError(_("No attachment provided."))
+        if not attachment.checksum:
+            return None
+
+        company = attachment.company_id or self.env.company
+        model_name = self._gemini_get_config(company.id)[1]
+        extracted_data = self.env['hr.applicant.gemini.cache'].sudo()._get_cached_result(
+            attachment.checksum, model_name, GEMINI_CV_EXTRACTION_PROMPT_VERSION
+        )
+        if extracted_data:
+            _logger.info(
+                "Using cached Gemini extraction for attachment %s (%s).",
+                attachment.name, record_id or 'unknown'
+            )
+        return extracted_data
+
+    @api.model
+    def _gemini_parse_cv_response(self, attachment, response_text, record_id=None):
+        """
+        Parses the Gemini response for a CV attachment and caches the result.
+        """
+        extracted_data = self._parse_gemini_response(response_text, record_id=record_id)
+        if attachment.checksum:
+            company = attachment.company_id or self.env.company
+            model_name = self._gemini_get_config(company.id)[1]
+            self.env['hr.applicant.gemini.cache'].sudo()._store_result(
+                attachment.checksum, model_name, GEMINI_CV_EXTRACTION_PROMPT_VERSION, extracted_data
+            )
+        return extracted_data
+
     @api.model
     def _parse_gemini_response(self, response_text, record_id=None):
         """
         Cleans and parses the text response from Gemini.
+
+        Responses are requested as schema-constrained JSON, so the direct
+        parse normally succeeds. The fallbacks only recover responses cut
+        short (e.g. by the output token limit) or from models without
+        structured output support.
         """
         log_id = record_id or 'unknown'
         try:
             # First, try to parse directly.
             try:
-                return json.loads(response_text)
+                return _json_loads(response_text)
             except json.JSONDecodeError:
-                _logger.warning("Direct JSON parsing failed for %s, checking for fences.", log_id)
-                pass
+                _logger.warning("Direct JSON parsing failed for %s, trying to recover it.", log_id)
+
+            # json_repair strips fences and surrounding text and fixes the
+            # usual glitches (trailing commas, unescaped quotes, truncation).
+            # It turns any text into some JSON, so its result is only kept
+            # if it has the shape of the extraction schema.
+            if json_repair:
+                repaired = json_repair.loads(response_text)
+                if _gemini_is_cv_data(repaired):
+                    return repaired
+                _logger.warning("Repaired JSON of %s does not match the extraction schema.", log_id)
 
             # Fallback 1: find json block
-            match = re.search(r"```json\n(.*?)\n```", response_text, re.DOTALL)
+            match = _JSON_FENCE_RE.search(response_text)
             if match:
                 json_text = match.group(1)
             else:
                 # Fallback 2: look for { ... }
-                match = re.search(r"\{.*\}", response_text, re.DOTALL)
+                match = _JSON_OBJECT_RE.search(response_text)
                 if match:
                     json_text = match.group(0)
                 else:
@@ -360,7 +933,7 @@ class HrApplicant(models.Model):
                     raise json.JSONDecodeError("No JSON object found in response.", response_text, 0)
 
             json_text = json_text.strip()
-            return json.loads(json_text)
+            return _json_loads(json_text)
 
         except json.JSONDecodeError as e:
             _logger.error(
@@ -380,6 +953,9 @@ class HrApplicant(models.Model):
         to `self` (an hr.applicant record).
         
         This is an INSTANCE method, as it operates on a specific applicant.
+        Callers must run it inside a savepoint: a failure while writing the
+        simple data is re-raised for the caller to roll back, while a failure
+        while processing skills only rolls back the skills.
         
         Args:
             extracted_data (dict): The parsed JSON data from Gemini.
@@ -392,14 +968,16 @@ class HrApplicant(models.Model):
         skills_list = []
 
         # --- Transaction Step 1: Process Simple Data ---
+        # No savepoint of its own: the caller's savepoint already rolls
+        # this back if it fails.
         try:
-            with self.env.cr.savepoint():
-                self._write_extracted_data(extracted_data)
-                
-                # Check for skills to process
-                if (extracted_data.get('skills') and
-                        self.env['ir.module.module']._get('hr_recruitment_skills').state == 'installed'):
-                    skills_list = extracted_data.get('skills')
+            self._write_extracted_data(extracted_data)
+
+            # Check for skills to process. 'hr_recruitment_skills' is an
+            # optional dependency, so only do this if its models are loaded.
+            # This is an in-memory registry lookup: no query, nothing to cache.
+            if extracted_data.get('skills') and 'hr.applicant.skill' in self.env:
+                skills_list = extracted_data.get('skills')
         except Exception as e_simple:
             _logger.error(
                 "Failed to write simple data for Applicant %s: %s.",
@@ -461,7 +1039,7 @@ class HrApplicant(models.Model):
             linkedin_url = data['linkedin']
             # Use regex to find a URL, even if it's in markdown [text](url)
             # This makes the import robust against markdown in the AI's response
-            match = re.search(r'(https?://[^\s)\]]+)', linkedin_url)
+            match = _LINKEDIN_URL_RE.search(linkedin_url)
             if match:
                 write_vals['linkedin_profile'] = match.group(1)
             else:
@@ -489,63 +1067,88 @@ class HrApplicant(models.Model):
                     write_vals['type_id'] = degree_rec.id
 
         if write_vals:
-            _logger.info(
-                "Writing data for Applicant %s: \n%s",
-                self.id,
-                json.dumps(write_vals, indent=2)
-            )
+            if _logger.isEnabledFor(logging.INFO):
+                _logger.info(
+                    "Writing data for Applicant %s: \n%s",
+                    self.id,
+                    json.dumps(write_vals, indent=2)
+                )
             self.write(write_vals)
         else:
             _logger.info("No new simple data to write for applicant %s.", self.id)
 
-    def _get_or_create_default_skill_level(self):
+    @api.model
+    @tools.ormcache()
+    def _search_default_skill_level_id(self):
         """
-        Finds or creates a 'Beginner (15%)' skill level to use as a fallback
-        when a skill level is not provided or recognized.
-        
+        Finds a 'Beginner (15%)' skill level to use as a fallback when a
+        skill level is not provided or recognized.
+
         This uses a multi-step fallback to be robust:
         1. Try to find the exact match (Name + Progress).
         2. Fallback to finding by name only.
         3. Fallback to finding the lowest progress level > 0.
-        4. Fallback to creating the level.
+
+        The result is cached in the registry, so the lookups run once per
+        worker instead of once per applicant. Only levels found by the
+        searches are cached: a level created by `_get_default_skill_level`
+        may still be rolled back with its transaction.
 
         Returns:
-            hr.skill.level: The default skill level record.
+            int: The ID of the default skill level record, or False.
         """
-        self.ensure_one() # This is an instance method, so self is an applicant
         skill_level_env = self.env['hr.skill.level']
-        default_name = 'Beginner'
-        default_progress = 15
 
         # 1. Try to find the exact match
         default_level = skill_level_env.search([
-            ('name', '=ilike', default_name),
-            ('level_progress', '=', default_progress)
+            ('name', '=ilike', GEMINI_DEFAULT_SKILL_LEVEL_NAME),
+            ('level_progress', '=', GEMINI_DEFAULT_SKILL_LEVEL_PROGRESS)
         ], limit=1)
 
         # 2. Fallback: find any "Beginner"
         if not default_level:
             default_level = skill_level_env.search([
-                ('name', '=ilike', default_name)
+                ('name', '=ilike', GEMINI_DEFAULT_SKILL_LEVEL_NAME)
             ], limit=1)
 
         # 3. Fallback: find the lowest progress level
         if not default_level:
-             default_level = skill_level_env.search(
-                 [('level_progress', '>', 0)],
-                 order='level_progress asc',
-                 limit=1
+            default_level = skill_level_env.search(
+                [('level_progress', '>', 0)],
+                order='level_progress asc',
+                limit=1
             )
 
-        # 4. Create if it doesn't exist
-        if not default_level:
+        return default_level.id
+
+    def _get_default_skill_level(self):
+        """
+        Returns:
+            hr.skill.level: The default skill level record, created if no
+                            level can be found.
+        """
+        skill_level_env = self.env['hr.skill.level']
+        default_level = skill_level_env.browse(self._search_default_skill_level_id())
+        if not default_level.exists():
+            # Nothing was found, or the cached level was deleted since: only
+            # drop this method's cache entry and search again.
+            cache = type(self)._search_default_skill_level_id.__cache__
+            entries, key, _counter = cache.lru(self)
+            try:
+                del entries[key + cache.key(self)]
+            except KeyError:
+                pass
+            default_level = skill_level_env.browse(self._search_default_skill_level_id())
+
+        # 4. Create the level if none exists
+        if not default_level.exists():
             _logger.warning(
                 "No 'Beginner (15%)' skill level found. Creating a new one."
             )
             try:
                 default_level = skill_level_env.create({
-                    'name': default_name,
-                    'level_progress': default_progress
+                    'name': GEMINI_DEFAULT_SKILL_LEVEL_NAME,
+                    'level_progress': GEMINI_DEFAULT_SKILL_LEVEL_PROGRESS
                 })
             except Exception as e:
                 _logger.error("Failed to create default 'Beginner (15%)' skill level: %s", str(e))
@@ -553,9 +1156,40 @@ class HrApplicant(models.Model):
                     "Could not create default 'Beginner (15%)' skill level. "
                     "Please create one manually in the Skills module. Error: %s"
                 ) % str(e))
-
         return default_level
 
+    @api.model
+    def _gemini_search_by_names(self, model_env, names):
+        """
+        Returns the records of `model_env` whose name matches one of `names`
+        (case-insensitive).
+
+        Exact matches are fetched first with a plain `in` domain. Only the
+        names not found that way are looked up with one combined `=ilike`
+        query, which is usually not needed at all.
+        """
+        if not names:
+            return model_env.browse()
+        records = model_env.search([('name', 'in', list(names))])
+        found_names = {name.lower() for name in records.mapped('name')}
+        missing_names = [name for name in names if name.lower() not in found_names]
+        if missing_names:
+            records |= model_env.search(
+                expression.OR([[('name', '=ilike', name)] for name in missing_names])
+            )
+        return records
+
+    @api.model
+    def _gemini_records_by_name(self, model_env, names):
+        """
+        Returns:
+            dict: lowercased name -> first record of `model_env` matching it.
+        """
+        records_by_name = {}
+        for record in self._gemini_search_by_names(model_env, names):
+            records_by_name.setdefault(record.name.lower(), record)
+        return records_by_name
+
     def _process_skills(self, skills_list):
         """
         Processes the structured skill list from Gemini:
@@ -564,7 +1198,11 @@ class HrApplicant(models.Model):
         It finds or creates Skill Types, Skill Levels, and Skills,
         then links them to the applicant.
         
-        This method uses caches to reduce database queries within the loop.
+        All referenced types, levels, skills and existing applicant-skill
+        links are prefetched up front and matched through in-memory
+        lowercase-name dicts, and missing types,
+        levels, skills and applicant-skill links are created with one
+        `create` call per model.
         
         Args:
             skills_list (list): A list of skill dictionaries from Gemini.
@@ -579,14 +1217,8 @@ class HrApplicant(models.Model):
         skill_env = self.env['hr.skill']
         applicant_skill_env = self.env['hr.applicant.skill']
 
-        # Cache for records found/created in this run to reduce DB queries
-        type_cache = {}
-        level_cache = {}
-        skill_cache = {}
-
-        # Lazy-load the default level only if needed
-        default_level = None
-
+        # --- 1. Collect the valid skill items and the names they reference ---
+        skill_items = []
         for skill_obj in skills_list:
             if not isinstance(skill_obj, dict):
                 _logger.warning("Skipping invalid skill item (not a dict): %s", skill_obj)
@@ -600,97 +1232,141 @@ class HrApplicant(models.Model):
                 _logger.warning("Skipping skill with no name: %s", skill_obj)
                 continue
 
-            try:
-                # --- 1. Find or Create Skill Type ---
-                type_name_lower = type_name_str.lower()
-                skill_type = type_cache.get(type_name_lower)
-                if not skill_type:
-                    skill_type = skill_type_env.search([('name', '=ilike', type_name_str)], limit=1)
-                    if not skill_type:
-                        skill_type = skill_type_env.create({'name': type_name_str})
-                    type_cache[type_name_lower] = skill_type
-
-                # --- 2. Find or Create Skill Level ---
-                skill_level = None
-                if level_name_str:
-                    level_name_lower = level_name_str.lower()
-                    skill_level = level_cache.get(level_name_lower)
-                    if not skill_level:
-                        # Try to parse "Name (Progress%)"
-                        match = re.match(r"(.+?)\s*\((\d+)%\)", level_name_str)
-                        if match:
-                            level_name_clean = match.group(1).strip()
-                            level_progress = int(match.group(2))
-                            skill_level = skill_level_env.search([
-                                ('name', '=ilike', level_name_clean),
-                                ('level_progress', '=', level_progress)
-                            ], limit=1)
-                        
-                        # Fallback: search by name only
-                        if not skill_level:
-                            skill_level = skill_level_env.search([('name', '=ilike', level_name_str)], limit=1)
-                        
-                        # Fallback: create it if we have parsed info
-                        if not skill_level and match:
-                            skill_level = skill_level_env.create({
-                                'name': level_name_clean,
-                                'level_progress': level_progress
-                            })
-
-                        if skill_level:
-                            level_cache[level_name_lower] = skill_level
-
-                # If no level found/created after all checks, get the default
-                if not skill_level:
-                    if not default_level:  # Lazy-load
-                        default_level = self._get_or_create_default_skill_level()
-                    skill_level = default_level
-
-                # --- 3. Associate Level with Type (Fixes NOT NULL constraint) ---
-                # This is required by the `hr_recruitment_skills` module
-                if skill_level not in skill_type.skill_level_ids:
-                    skill_type.write({'skill_level_ids': [(4, skill_level.id)]})
-
-                # --- 4. Find or Create Skill ---
-                skill_name_lower = skill_name_str.lower()
-                skill = skill_cache.get(skill_name_lower)
-                if not skill:
-                    skill = skill_env.search([('name', '=ilike', skill_name_str)], limit=1)
-                    if not skill:
-                        # Create new skill
-                        skill = skill_env.create({
-                            'name': skill_name_str,
-                            'skill_type_id': skill_type.id
-                        })
-                    elif skill.skill_type_id != skill_type:
-                        # Ensure existing skill has the correct type
-                        skill.write({'skill_type_id': skill_type.id})
-                    
-                    skill_cache[skill_name_lower] = skill
-
-                # --- 5. Create Applicant-Skill Link ---
-                existing_link = applicant_skill_env.search([
-                    ('applicant_id', '=', self.id),
-                    ('skill_id', '=', skill.id)
-                ], limit=1)
-
-                if not existing_link:
-                    applicant_skill_env.create({
-                        'applicant_id': self.id,
-                        'skill_id': skill.id,
-                        'skill_level_id': skill_level.id,
-                        'skill_type_id': skill_type.id,
-                    })
-                    _logger.info(
-                        "Created link for applicant %s skill: %s (Type: %s, Level: %s)",
-                        self.id, skill.name, skill_type.name, skill_level.name
-                    )
+            # Try to parse "Name (Progress%)"
+            level_match = _SKILL_LEVEL_RE.match(level_name_str) if level_name_str else None
+            level_parsed = (level_match.group(1).strip(), int(level_match.group(2))) if level_match else None
+            skill_items.append((skill_obj, skill_name_str, type_name_str, level_name_str, level_parsed))
+
+        if not skill_items:
+            return
 
-            except Exception as e_item:
+        level_names = set()
+        for _obj, _skill, _type, level_name_str, level_parsed in skill_items:
+            if level_name_str:
+                level_names.add(level_name_str)
+            if level_parsed:
+                level_names.add(level_parsed[0])
+
+        # --- 2. Prefetch existing records by name ---
+        type_by_name = self._gemini_records_by_name(
+            skill_type_env, {item[2] for item in skill_items})
+        skill_by_name = self._gemini_records_by_name(
+            skill_env, {item[1] for item in skill_items})
+
+        level_by_name = {}
+        level_by_name_progress = {}
+        for level in self._gemini_search_by_names(skill_level_env, level_names):
+            level_by_name.setdefault(level.name.lower(), level)
+            level_by_name_progress.setdefault((level.name.lower(), level.level_progress), level)
+
+        # --- 3. Create missing Skill Types and Skill Levels in one call each ---
+        missing_types = {}
+        missing_levels = {}
+        for _obj, _skill, type_name_str, level_name_str, level_parsed in skill_items:
+            if type_name_str.lower() not in type_by_name:
+                missing_types.setdefault(type_name_str.lower(), type_name_str)
+            if level_parsed:
+                key = (level_parsed[0].lower(), level_parsed[1])
+                if key not in level_by_name_progress and level_name_str.lower() not in level_by_name:
+                    missing_levels.setdefault(key, level_parsed)
+
+        if missing_types:
+            new_types = skill_type_env.create([{'name': name} for name in missing_types.values()])
+            type_by_name.update(zip(missing_types, new_types))
+        if missing_levels:
+            new_levels = skill_level_env.create([
+                {'name': name, 'level_progress': progress}
+                for name, progress in missing_levels.values()
+            ])
+            level_by_name_progress.update(zip(missing_levels, new_levels))
+
+        # --- 4. Create missing Skills in one call, fix the type of existing ones ---
+        missing_skills = {}
+        for _obj, skill_name_str, type_name_str, _level, _parsed in skill_items:
+            skill_name_lower = skill_name_str.lower()
+            if skill_name_lower in missing_skills:
+                continue
+            skill_type = type_by_name[type_name_str.lower()]
+            skill = skill_by_name.get(skill_name_lower)
+            if not skill:
+                missing_skills[skill_name_lower] = {
+                    'name': skill_name_str,
+                    'skill_type_id': skill_type.id,
+                }
+            elif skill.skill_type_id != skill_type:
+                # Ensure existing skill has the correct type
+                skill.write({'skill_type_id': skill_type.id})
+
+        if missing_skills:
+            new_skills = skill_env.create(list(missing_skills.values()))
+            skill_by_name.update(zip(missing_skills, new_skills))
+
+        # --- 5. Prefetch the existing Applicant-Skill links ---
+        linked_skill_ids = set(applicant_skill_env.search([
+            ('applicant_id', '=', self.id),
+            ('skill_id', 'in', [skill.id for skill in skill_by_name.values()]),
+        ]).mapped('skill_id').ids)
+
+        # Lazy-load the default level only if needed
+        default_level = None
+        # Levels to associate with each type, written once per type
+        type_to_levels = defaultdict(set)
+        resolved_items = []
+
+        for skill_obj, skill_name_str, type_name_str, level_name_str, level_parsed in skill_items:
+            skill_type = type_by_name[type_name_str.lower()]
+            skill = skill_by_name[skill_name_str.lower()]
+
+            # --- 6. Resolve the Skill Level ---
+            skill_level = None
+            if level_parsed:
+                skill_level = level_by_name_progress.get((level_parsed[0].lower(), level_parsed[1]))
+            if not skill_level and level_name_str:
+                # Fallback: match by name only
+                skill_level = level_by_name.get(level_name_str.lower())
+
+            # If no level found/created after all checks, get the default
+            if not skill_level:
+                if not default_level:  # Lazy-load
+                    default_level = self._get_default_skill_level()
+                skill_level = default_level
+
+            type_to_levels[skill_type].add(skill_level.id)
+            resolved_items.append((skill_obj, skill, skill_type, skill_level))
+
+        # --- 7. Associate Levels with Types (Fixes NOT NULL constraint) ---
+        # This is required by the `hr_recruitment_skills` module.
+        # Only the levels not already linked are written, one write per type.
+        for skill_type, level_ids in type_to_levels.items():
+            new_level_ids = level_ids - set(skill_type.skill_level_ids.ids)
+            if new_level_ids:
+                skill_type.write({'skill_level_ids': [(4, level_id) for level_id in new_level_ids]})
+
+        # --- 8. Create the missing Applicant-Skill Links in one call ---
+        new_links = []
+        for _obj, skill, skill_type, skill_level in resolved_items:
+            if skill.id in linked_skill_ids:
+                continue
+            new_links.append({
+                'applicant_id': self.id,
+                'skill_id': skill.id,
+                'skill_level_id': skill_level.id,
+                'skill_type_id': skill_type.id,
+            })
+            linked_skill_ids.add(skill.id)
+            _logger.info(
+                "Creating link for applicant %s skill: %s (Type: %s, Level: %s)",
+                self.id, skill.name, skill_type.name, skill_level.name
+            )
+
+        if new_links:
+            try:
+                applicant_skill_env.create(new_links)
+            except Exception as e:
                 _logger.error(
-                    "Failed to process skill item %s for applicant %s: %s",
-                    skill_obj, self.id, str(e_item), exc_info=True
+                    "Failed to create skill links for applicant %s: %s",
+                    self.id, str(e), exc_info=True
                 )
                 # Re-raise to roll back this applicant's entire skill transaction
                 # The outer savepoint in _run_gemini_extraction_job will catch this.
-                raise
\ No newline at end of file
+                raise
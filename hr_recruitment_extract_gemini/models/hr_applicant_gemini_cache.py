@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+import json
+import logging
+
+from odoo import api, fields, models
+
+_logger = logging.getLogger(__name__)
+
+GEMINI_CACHE_RETENTION_DAYS = 30
+
+
+class HrApplicantGeminiCache(models.Model):
+    """
+    Stores the parsed Gemini extraction result of a CV, keyed by the
+    checksum of the CV content, the Gemini model and the prompt version.
+    Identical CVs (re-uploads, re-applications, retries) are then served
+    from this table instead of calling the Gemini API again.
+
+    Entries are deleted by the daily autovacuum once they are older than
+    the `gemini.cv.cache_retention_days` system parameter (default: 30 days).
+    """
+    _name = 'hr.applicant.gemini.cache'
+    _description = 'Gemini CV Extraction Cache'
+
+    checksum = fields.Char(
+        string="Checksum",
+        required=True,
+        readonly=True,
+        help="SHA-1 checksum of the CV file content, as stored on `ir.attachment`."
+    )
+    model = fields.Char(
+        string="Gemini Model",
+        required=True,
+        readonly=True,
+        help="The Gemini model that produced the cached result."
+    )
+    prompt_version = fields.Char(
+        string="Prompt Version",
+        required=True,
+        readonly=True,
+        help="Version of the extraction prompt used to produce the cached result."
+    )
+    result_json = fields.Json(
+        string="Extracted Data",
+        readonly=True,
+        help="The parsed JSON data returned by Gemini."
+    )
+
+    _sql_constraints = [
+        ('checksum_model_prompt_uniq',
+         'unique(checksum, model, prompt_version)',
+         "A CV can only be cached once per Gemini model and prompt version."),
+    ]
+
+    @api.model
+    def _get_cached_result(self, checksum, model_name, prompt_version):
+        """
+        Returns the cached extraction result, or None on a miss.
+        The lookup goes through the unique index of the key.
+        """
+        entry = self.search([
+            ('checksum', '=', checksum),
+            ('model', '=', model_name),
+            ('prompt_version', '=', prompt_version),
+        ], limit=1)
+        return entry.result_json if entry else None
+
+    @api.model
+    def _store_result(self, checksum, model_name, prompt_version, result):
+        """
+        Stores an extraction result. Concurrent jobs may extract the same CV,
+        so conflicting inserts are ignored instead of failing the job.
+        """
+        self.env.cr.execute("""
+            INSERT INTO hr_applicant_gemini_cache
+                (checksum, model, prompt_version, result_json,
+                 create_uid, create_date, write_uid, write_date)
+            VALUES (%s, %s, %s, %s, %s, now() at time zone 'UTC', %s, now() at time zone 'UTC')
+            ON CONFLICT (checksum, model, prompt_version) DO NOTHING
+        """, (
+            checksum, model_name, prompt_version, json.dumps(result),
+            self.env.uid, self.env.uid,
+        ))
+
+    @api.autovacuum
+    def _gc_expired_entries(self):
+        """
+        Deletes the entries older than the retention period. The cached
+        results hold personal data (name, email, phone) of the candidates,
+        so they are not kept after the CVs stop being re-submitted.
+        """
+        retention_days = int(self.env['ir.config_parameter'].sudo().get_param(
+            'gemini.cv.cache_retention_days', GEMINI_CACHE_RETENTION_DAYS
+        ))
+        self.env.cr.execute("""
+            DELETE FROM hr_applicant_gemini_cache
+            WHERE create_date < (now() at time zone 'UTC') - make_interval(days => %s)
+        """, (max(retention_days, 0),))
+        _logger.info("GC'd %d Gemini CV cache entries", self.env.cr.rowcount)
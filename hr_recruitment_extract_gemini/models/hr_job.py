@@ -1,15 +1,31 @@
 # -*- coding: utf-8 -*-
-import base64
-import json
 import logging
 import odoo
-import re
 
+from collections import defaultdict
+
+from psycopg2.errors import LockNotAvailable
 from odoo import api, fields, models, _
 from odoo.exceptions import UserError
 
+from .hr_applicant import GEMINI_BULK_CV_JOB_PRIORITY, GEMINI_QUEUE_JOB_CHANNEL
+
 _logger = logging.getLogger(__name__)
 
+# Each CV of a bulk import is processed in its own savepoint (subtransaction).
+# PostgreSQL slows down noticeably once a transaction holds more than 64 of
+# them, so the job commits after every GEMINI_BULK_COMMIT_INTERVAL CVs.
+GEMINI_BULK_COMMIT_INTERVAL = 20
+
+# Context of the applicant creation in bulk imports: no creation message,
+# follower subscription or field tracking per applicant.
+GEMINI_BULK_CREATE_CONTEXT = {
+    'tracking_disable': True,
+    'mail_create_nolog': True,
+    'mail_create_nosubscribe': True,
+    'mail_notrack': True,
+}
+
 
 class HrJob(models.Model):
     _inherit = 'hr.job'
@@ -62,8 +78,23 @@ class HrJob(models.Model):
         self.ensure_one()
 
         try:
-            # Database lock to prevent double-clicks
-            self.env.cr.execute('SELECT * FROM hr_job WHERE id = %s FOR UPDATE', (self.id,))
+            # Database lock to prevent double-clicks. NOWAIT makes a second
+            # click fail right away instead of waiting for the first one.
+            try:
+                self.env.cr.execute(
+                    'SELECT id FROM hr_job WHERE id = %s FOR UPDATE NOWAIT',
+                    (self.id,),
+                    log_exceptions=False
+                )
+            except LockNotAvailable:
+                _logger.warning(
+                    "User %s tried to process bulk CVs (Gemini) for job %s, but it was locked.",
+                    self.env.user.id, self.id
+                )
+                raise UserError(_(
+                    "This job is currently being processed by another user or "
+                    "background task. Please try again later."
+                ))
             
             # Re-browse to get the freshest data
             job = self.browse(self.id)
@@ -75,8 +106,17 @@ class HrJob(models.Model):
             if not job.cv_attachment_ids:
                 raise UserError(_("Please attach CV files before processing."))
 
-            # Calculate which attachments to process
-            attachments_to_process = job.cv_attachment_ids - job.processed_cv_attachment_ids
+            # Calculate which attachments to process, directly on the
+            # relation tables instead of loading both recordsets
+            job.flush_recordset(['cv_attachment_ids', 'processed_cv_attachment_ids'])
+            self.env.cr.execute("""
+                SELECT attachment_id FROM hr_job_cv_attachment_gemini_rel WHERE job_id = %s
+                EXCEPT
+                SELECT attachment_id FROM hr_job_cv_attachment_gemini_processed_rel WHERE job_id = %s
+            """, (job.id, job.id))
+            attachments_to_process = self.env['ir.attachment'].browse(
+                sorted(row[0] for row in self.env.cr.fetchall())
+            )
 
             if not attachments_to_process:
                 raise UserError(_("All attached CVs have already been processed successfully. Please delete the attached files to start a new batch."))
@@ -94,7 +134,11 @@ class HrJob(models.Model):
             })
 
             # Pass the user ID and attachment IDs to the job
-            job.with_delay()._process_gemini_cvs_thread(self.env.user.id, attachments_to_process.ids)
+            job.with_delay(
+                channel=GEMINI_QUEUE_JOB_CHANNEL,
+                priority=GEMINI_BULK_CV_JOB_PRIORITY,
+                description=_("Gemini bulk CV processing: %s (%s CVs)", job.name, len(attachments_to_process)),
+            )._process_gemini_cvs_thread(self.env.user.id, attachments_to_process.ids)
 
             # Return a toast notification to the user
             return {
@@ -148,28 +192,114 @@ class HrJob(models.Model):
             }
         }
 
-    def _notify_user(self, user_id, params):
-        """Helper to send a notification to a specific user."""
+    def _notify_user(self, user_id, params_list, new_cursor=True):
+        """
+        Helper to send notifications to a specific user.
+
+        All notifications of `params_list` are sent with a single cursor and
+        commit. With `new_cursor=False` they are sent within the job's own
+        transaction instead, and delivered when it is committed.
+        """
+        if not new_cursor:
+            user = self.env['res.users'].browse(user_id)
+            if user.partner_id:
+                for params in params_list:
+                    self.env['bus.bus']._sendone(user.partner_id, 'simple_notification', params)
+            return
         try:
             # Use a new cursor to ensure notification is sent
             with odoo.registry(self.env.cr.dbname).cursor() as notify_cr:
                 notify_env = api.Environment(notify_cr, self.env.uid, self.env.context)
                 user = notify_env['res.users'].browse(user_id)
                 if user.partner_id:
-                    notify_env['bus.bus']._sendone(user.partner_id, 'simple_notification', params)
+                    for params in params_list:
+                        notify_env['bus.bus']._sendone(user.partner_id, 'simple_notification', params)
                 notify_cr.commit()
         except Exception as e:
             _logger.error("Failed to send notification to user %s: %s", user_id, str(e))
 
     # --- Background Processing ---
 
-    def _process_gemini_cvs_thread(self, user_id, attachment_ids_to_process):
+    def _gemini_bulk_applicant_template(self):
+        """
+        Returns the applicant name pattern and the values shared by all the
+        applicants of a bulk import, translated once for the whole import.
+        """
+        return _("%s's Application"), {
+            'job_id': self.id,
+            'gemini_extract_state': 'done', # Use gemini field
+            'gemini_extract_status': _('Created from bulk import. Processing data...'), # Use gemini field
+        }
+
+    def _gemini_bulk_applicant_vals(self, att, data_dict, applicant_template):
+        """Returns the values to create the applicant of a bulk-imported CV."""
+        name_pattern, common_vals = applicant_template
+        # Standardize Applicant Name
+        applicant_name_str = data_dict.get('name') or att.name.rsplit('.', 1)[0]
+        return dict(
+            common_vals,
+            name=name_pattern % applicant_name_str,
+            partner_name=data_dict.get('name'),
+            email_from=data_dict.get('email'),
+            partner_phone=data_dict.get('phone'),
+        )
+
+    def _gemini_create_bulk_applicants(self, attachments, extracted_by_attachment, applicant_template):
+        """
+        Creates the applicants of the successfully extracted CVs among
+        `attachments` with a single `create` call.
+
+        Returns:
+            dict: attachment id -> new applicant. Empty if the grouped
+                  creation failed: the applicants are then created one by one.
+        """
+        attachments = attachments.filtered(
+            lambda att: att.file_size and isinstance(extracted_by_attachment.get(att.id), dict)
+        )
+        if not attachments:
+            return {}
+        try:
+            with self.env.cr.savepoint():
+                applicants = self.env['hr.applicant'].with_context(**GEMINI_BULK_CREATE_CONTEXT).create([
+                    self._gemini_bulk_applicant_vals(att, extracted_by_attachment[att.id], applicant_template)
+                    for att in attachments
+                ])
+        except Exception as e:
+            _logger.warning(f"Failed to create the applicants of job {self.name} at once, creating them one by one: {e}")
+            return {}
+        _logger.info(f"Created {len(applicants)} new applicants for job {self.name}")
+        # Back to the job's context for the processing of their data
+        return dict(zip(attachments.ids, applicants.with_env(self.env)))
+
+    def _gemini_write_applicant_statuses(self, applicant_ids_by_status):
+        """
+        Writes the extraction status of the bulk-imported applicants, with
+        one write per distinct status instead of one per applicant.
+        """
+        ApplicantEnv = self.env['hr.applicant']
+        for status_msg, applicant_ids in applicant_ids_by_status.items():
+            ApplicantEnv.browse(applicant_ids).write({'gemini_extract_status': status_msg}) # Use gemini field
+
+    def _process_gemini_cvs_thread(self, user_id, attachment_ids_to_process, with_commit=True):
         """
         This method runs in the background via the Odoo job queue.
         It processes only the specified CVs, creates applicants using Gemini,
         and notifies the user.
+
+        The CVs are processed in windows of GEMINI_BULK_COMMIT_INTERVAL CVs:
+        the CVs of a window are extracted at once (their Gemini calls run
+        concurrently), then their applicants are created in a single batch
+        by `_gemini_create_bulk_applicants`, which only falls back to creating
+        them one by one if the batch fails.
+        With `with_commit`, the job commits after every window, keeping the
+        applicants and cached extractions done so far, and releasing the
+        locks taken on the applicants, attachments and processed CVs. This
+        also keeps each transaction's snapshot short, so the job keeps Odoo's
+        REPEATABLE READ isolation, which the ORM relies on to detect
+        concurrent updates.
         """
         self.ensure_one()
+        job = self
         
         ApplicantEnv = self.env['hr.applicant']
         AttachmentEnv = self.env['ir.attachment']
@@ -177,86 +307,144 @@ class HrJob(models.Model):
         success_count = 0
         fail_count = 0
         errors = []
+        # CVs processed since the last commit, marked as processed in one write
+        processed_ids = []
+        # Status -> applicants of these CVs, written once per distinct status
+        applicant_ids_by_status = defaultdict(list)
         
-        attachments = AttachmentEnv.browse(attachment_ids_to_process)
+        # Skip CVs already committed as processed if the job is run again
+        attachments = AttachmentEnv.browse(attachment_ids_to_process) - job.processed_cv_attachment_ids
+        # Load the metadata used below in one query; the file contents are
+        # only read for the CVs actually sent to Gemini.
+        attachments.fetch(['name', 'mimetype', 'checksum', 'file_size', 'company_id'])
         critical_error = False
 
+        # Progress is reported once per 10% of the batch instead of per CV.
+        # Small batches, where a step would be a single CV, only get the
+        # final notification.
+        total_count = len(attachments)
+        progress_step = total_count // 10
+        applicant_template = job._gemini_bulk_applicant_template()
+
         try:
-            for att in attachments:
+            extracted_by_attachment = {}
+            new_applicants = {}
+            for index, att in enumerate(attachments):
+                if index % GEMINI_BULK_COMMIT_INTERVAL == 0:
+                    # Commit the CVs processed so far, which also keeps
+                    # their applicants if the job is interrupted later.
+                    if with_commit and index:
+                        job._gemini_write_applicant_statuses(applicant_ids_by_status)
+                        applicant_ids_by_status.clear()
+                        if processed_ids:
+                            job.write({'processed_cv_attachment_ids': [(4, att_id) for att_id in processed_ids]})
+                            processed_ids = []
+                        self.env.cr.commit()
+
+                    # 1-2. Call Gemini for the next CVs and parse the responses (or reuse the
+                    # cached results). Only the CVs of this window are held in memory.
+                    # The stored file size tells empty CVs apart without reading any file.
+                    window = attachments[index:index + GEMINI_BULK_COMMIT_INTERVAL]
+                    extracted_by_attachment = ApplicantEnv._gemini_extract_cvs_data(
+                        window.filtered('file_size')
+                    )
+
+                    # 3. Create the applicants of these CVs in one call
+                    new_applicants = job._gemini_create_bulk_applicants(
+                        window, extracted_by_attachment, applicant_template,
+                    )
+
+                if progress_step > 1 and index and index % progress_step == 0:
+                    # With `with_commit`, sent within the job's transaction and
+                    # delivered with the next intermediate commit, without a
+                    # cursor of its own. Without intermediate commits it would
+                    # only arrive with the final notification, so it is sent
+                    # on its own cursor instead.
+                    self._notify_user(user_id, [{
+                        'title': _('Processing CVs'),
+                        'message': _("Gemini CV processing for job '%s': %s of %s CVs done.",
+                                     self.name, index, total_count),
+                        'type': 'info',
+                        'sticky': False,
+                    }], new_cursor=not with_commit)
+
+                # Created above, outside of this CV's savepoint
+                precreated_applicant = new_applicants.pop(att.id, None)
                 try:
                     # Use a savepoint for each attachment to isolate failures
                     with self.env.cr.savepoint():
                         _logger.info(f"Processing CV (Gemini): {att.name} for job {self.name}")
                         
-                        if not att.datas:
+                        if not att.file_size:
                             _logger.warning(f"Skipping CV {att.name}: Attachment data is empty.")
                             continue
 
-                        # 1. Call Gemini
-                        response_text = ApplicantEnv._gemini_call_for_cv(att)
-                        
-                        # 2. Parse response
-                        log_id = f"job_{self.id}_att_{att.id}"
-                        data_dict = ApplicantEnv._parse_gemini_response(response_text, record_id=log_id)
+                        data_dict = extracted_by_attachment[att.id]
+                        if isinstance(data_dict, Exception):
+                            raise data_dict
 
-                        # Standardize Applicant Name
-                        applicant_name_str = data_dict.get('name') or att.name.rsplit('.', 1)[0]
-                        
-                        # 3. Create new applicant
-                        create_vals = {
-                            'name': _("%s's Application") % applicant_name_str,
-                            'partner_name': data_dict.get('name'),
-                            'email_from': data_dict.get('email'),
-                            'partner_phone': data_dict.get('phone'),
-                            'job_id': self.id,
-                            'gemini_extract_state': 'done', # Use gemini field
-                            'gemini_extract_status': _('Created from bulk import. Processing data...'), # Use gemini field
-                        }
-                        
-                        new_applicant = ApplicantEnv.create(create_vals)
-                        _logger.info(f"Created new applicant: {new_applicant.name} (ID: {new_applicant.id})")
+                        new_applicant = precreated_applicant
+                        if not new_applicant:
+                            # The grouped creation failed, create it on its own
+                            new_applicant = ApplicantEnv.with_context(**GEMINI_BULK_CREATE_CONTEXT).create(
+                                job._gemini_bulk_applicant_vals(att, data_dict, applicant_template)
+                            ).with_env(self.env)
+                            _logger.info(f"Created new applicant: {new_applicant.name} (ID: {new_applicant.id})")
 
                         # 4. Call processing method ON THE NEW APPLICANT
                         status_msg = new_applicant._process_extracted_cv_data(data_dict)
-                        new_applicant.write({'gemini_extract_status': status_msg}) # Use gemini field
 
-                        # 5. Attach original CV to the new applicant
-                        AttachmentEnv.create({
-                            'name': att.name,
-                            'datas': att.datas,
+                        # 5. Attach original CV to the new applicant. The copy
+                        # takes the raw content, without a base64 round trip.
+                        att.copy({
                             'res_model': 'hr.applicant',
                             'res_id': new_applicant.id,
                         })
                         
                         success_count += 1
-                        # Mark this CV as processed
-                        self.write({'processed_cv_attachment_ids': [(4, att.id)]})
                         _logger.info(f"Successfully processed applicant: {new_applicant.name}")
 
+                    processed_ids.append(att.id)
+                    applicant_ids_by_status[status_msg].append(new_applicant.id)
+
                 except Exception as e:
                     # This catches errors for *one* CV
                     _logger.error(f"Failed to process CV {att.name} for job {self.name} (Gemini): {e}", exc_info=True)
                     fail_count += 1
                     errors.append(f"{att.name}: {str(e)}")
-                    # The savepoint automatically rolls back this CV's transaction
+                    # The savepoint automatically rolls back this CV's transaction,
+                    # but not the applicant created beforehand with the others.
+                    if precreated_applicant:
+                        try:
+                            with self.env.cr.savepoint():
+                                precreated_applicant.unlink()
+                        except Exception as e_unlink:
+                            _logger.error(f"Failed to remove applicant {precreated_applicant.id} of failed CV {att.name}: {e_unlink}")
 
         except Exception as e:
             # This catches a critical, job-stopping error (e.g., in setup)
             critical_error = True
             _logger.error(f"Critical error during Gemini CV processing job {self.name}: {e}", exc_info=True)
             self.env.cr.rollback() 
+            # The applicants of these CVs were rolled back with the transaction
+            processed_ids = []
+            applicant_ids_by_status.clear()
             errors.append(f"Critical Job Failure: {str(e)}")
 
         finally:
             # This block *always* runs and *always* sends a notification.
             try:
+                job._gemini_write_applicant_statuses(applicant_ids_by_status)
+
                 # Update job state
                 final_vals = {
                     'processing_in_progress': False,
                     'processing_complete': True,
-                    'processing_failed': bool(fail_count > 0 or critical_error) 
+                    'processing_failed': bool(fail_count > 0 or critical_error),
+                    # Mark the remaining CVs as processed
+                    'processed_cv_attachment_ids': [(4, att_id) for att_id in processed_ids],
                 }
-                self.browse(self.id).write(final_vals)
+                job.write(final_vals)
 
             except Exception as e_finally:
                 # If the *final write* fails, we have a critical problem.
@@ -277,4 +465,4 @@ class HrJob(models.Model):
                 'type': 'success' if not job_failed else 'warning',
                 'sticky': job_failed, # Make notification sticky if there was an error
             }
-            self._notify_user(user_id, params)
\ No newline at end of file
+            self._notify_user(user_id, [params])
\ No newline at end of file
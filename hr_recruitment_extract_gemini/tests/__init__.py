@@ -1,3 +1,3 @@
 # -*- coding: utf-8 -*-
-# from . import test_hr_applicant_gemini
-# from . import test_hr_job_bulk_gemini
\ No newline at end of file
+from . import test_hr_applicant_gemini
+from . import test_hr_job_bulk_gemini
@@ -5,11 +5,20 @@ import odoo
 from unittest.mock import patch, MagicMock
 
 from odoo import _
+from odoo.api import Environment
 from odoo.tests.common import TransactionCase
 from odoo.exceptions import UserError
+from odoo.addons.queue_job.models.base import Base as QueueJobBase
 
 # Import the prompt constant from the model file
-from odoo.addons.hr_recruitment_extract_gemini.models.hr_applicant import GEMINI_CV_EXTRACTION_PROMPT_FILE
+from odoo.addons.hr_recruitment_extract_gemini.models.hr_applicant import (
+    GEMINI_CV_EXTRACTION_PROMPT_FILE,
+    GEMINI_CV_GENERATION_CONFIG,
+    _gemini_upload_file,
+    _gemini_uploaded_files,
+    _get_gemini_file_client,
+    _get_gemini_model,
+)
 
 # Sample successful response from Gemini
 MOCK_GEMINI_RESPONSE_JSON = {
@@ -24,6 +33,15 @@ MOCK_GEMINI_RESPONSE_JSON = {
     ]
 }
 
+# Serialized once for all the mocked API responses
+MOCK_GEMINI_RESPONSE_TEXT = json.dumps(MOCK_GEMINI_RESPONSE_JSON)
+
+# Content of the test CVs and their attachment data
+MOCK_CV_CONTENT = b'This is a fake PDF content'
+MOCK_CV_DATAS = base64.b64encode(MOCK_CV_CONTENT)
+MOCK_CV_2_CONTENT = b'This is another fake PDF content'
+MOCK_CV_2_DATAS = base64.b64encode(MOCK_CV_2_CONTENT)
+
 # Sample error response from Gemini
 MOCK_GEMINI_RESPONSE_ERROR = "Test API Error"
 
@@ -31,6 +49,23 @@ MOCK_GEMINI_RESPONSE_ERROR = "Test API Error"
 MOCK_GEMINI_RESPONSE_INVALID_JSON = "Here is the data: { 'name': 'test' "
 
 
+class _SyncDelay:
+    """
+    Stands for the object returned by `with_delay()`: the job methods
+    called on it run immediately on the captured applicant record(s).
+    """
+    __slots__ = ('_records',)
+
+    def __init__(self, records):
+        self._records = records
+
+    def _run_gemini_extraction_job(self, *args, **kwargs):
+        return self._records._run_gemini_extraction_job(*args, **kwargs)
+
+    def _run_gemini_batch_extraction_job(self, *args, **kwargs):
+        return self._records._run_gemini_batch_extraction_job(*args, **kwargs)
+
+
 class TestHrApplicantGemini(TransactionCase):
     """
     Test suite for the `hr.applicant` Gemini extraction functionality.
@@ -46,26 +81,18 @@ class TestHrApplicantGemini(TransactionCase):
         - Create required related data (e.g., skill module setup).
         """
         super().setUpClass()
-        
-        # Mock the check for hr_recruitment_skills being installed
-        mock_module = MagicMock()
-        mock_module.state = 'installed'
-        
-        cls.mock_get_patcher = patch.object(
-            type(cls.env['ir.module.module']), 
-            '_get', 
-            MagicMock(return_value=mock_module)
-        )
-        cls.mock_get_patcher.start()
+
+        # Model classes patched by the tests, resolved once
+        cls.Applicant = type(cls.env['hr.applicant'])
+        cls.BusBus = type(cls.env['bus.bus'])
 
         cls.applicant = cls.env['hr.applicant'].create({
             'name': "Test Applicant's Application",
         })
 
-        cls.attachment_datas = base64.b64encode(b'This is a fake PDF content')
         cls.attachment = cls.env['ir.attachment'].create({
             'name': 'test_cv.pdf',
-            'datas': cls.attachment_datas,
+            'datas': MOCK_CV_DATAS,
             'mimetype': 'application/pdf',
             'res_model': 'hr.applicant',
             'res_id': cls.applicant.id,
@@ -79,157 +106,130 @@ class TestHrApplicantGemini(TransactionCase):
             'gemini_model': 'fake-model-name',
         })
         
-        # Pre-create the default skill level to avoid errors
-        cls.env['hr.skill.level'].create({
-            'name': 'Beginner',
-            'level_progress': 15,
+        # Create REAL records for the extracted degree and skills to find,
+        # one `create` per model. The default skill level (Beginner) is
+        # pre-created to avoid errors. 'hr_recruitment_skills' is optional,
+        # so the skill records (and checks) are skipped without it.
+        cls.real_degree = cls.env['hr.recruitment.degree'].create({
+            'name': "Bachelor's Degree in Computer Science"
         })
+        cls.with_skills = 'hr.applicant.skill' in cls.env
+        if cls.with_skills:
+            cls.skill_type_prog, cls.skill_type_lang = cls.env['hr.skill.type'].create([
+                {'name': 'Programming Languages'},
+                {'name': 'Languages'},
+            ])
+            _default_level, cls.skill_level_adv, cls.skill_level_c1 = cls.env['hr.skill.level'].create([
+                {'name': 'Beginner', 'level_progress': 15},
+                {'name': 'Advanced', 'level_progress': 80},
+                {'name': 'C1', 'level_progress': 85},
+            ])
+            cls.real_skill_py, cls.real_skill_en = cls.env['hr.skill'].create([
+                {'name': 'Python', 'skill_type_id': cls.skill_type_prog.id},
+                {'name': 'English', 'skill_type_id': cls.skill_type_lang.id},
+            ])
+
+        # Patch `commit()` and `rollback()` of the test cursor only, once
+        # for the whole class: the other cursors keep their behavior.
+        for method in ('commit', 'rollback'):
+            patcher = patch.object(cls.cr, method, lambda *args, **kwargs: None)
+            patcher.start()
+            cls.addClassCleanup(patcher.stop)
+
+        # Patch `with_delay()` to run the jobs immediately and synchronously.
+        # It is patched once, on the queue_job class defining it, instead of
+        # on the applicant model class for every test.
+        def mock_with_delay(self_recordset, *args, **kwargs):
+            return _SyncDelay(self_recordset)
 
-    @classmethod
-    def tearDownClass(cls):
-        """Stop class-level patchers."""
-        super().tearDownClass()
-        cls.mock_get_patcher.stop()
+        delay_patcher = patch.object(QueueJobBase, 'with_delay', new=mock_with_delay)
+        delay_patcher.start()
+        cls.addClassCleanup(delay_patcher.stop)
+
+        # Patch the Gemini client bound to the models, so that no
+        # real client (and credentials) is created
+        client_patcher = patch(
+            'odoo.addons.hr_recruitment_extract_gemini.models.hr_applicant.genai_client.get_default_generative_client'
+        )
+        client_patcher.start()
+        cls.addClassCleanup(client_patcher.stop)
+
+        # Patch the bus notification, reset before each test
+        bus_patcher = patch.object(cls.BusBus, '_sendone', MagicMock(return_value=True))
+        cls.mock_bus_sendone = bus_patcher.start()
+        cls.addClassCleanup(bus_patcher.stop)
 
     def setUp(self):
         """
-        Override setUp to mock queue_job and bus notifications.
+        Override setUp to reset the shared mocks.
         """
         super().setUp()
 
-        # 1. Patch `self.env.cr.commit()` and `self.env.cr.rollback()`
-        self.commit_patcher = patch('odoo.sql_db.Cursor.commit', lambda *args, **kwargs: None)
-        self.commit_patcher.start()
-        self.rollback_patcher = patch('odoo.sql_db.Cursor.rollback', lambda *args, **kwargs: None)
-        self.rollback_patcher.start()
+        # 1. Forget the notifications sent by previous tests
+        self.mock_bus_sendone.reset_mock()
 
-        # 2. Patch `with_delay()` to run the job immediately and synchronously
-        def mock_with_delay(self_recordset, *args, **kwargs):
-            """
-            This mock captures the recordset and returns a mock object.
-            When a method (e.g., `_run_gemini_extraction_job`) is called
-            on this object, we run it immediately on the captured recordset.
-            """
-            mock_delay_obj = MagicMock()
-            
-            # This explicitly mocks the method we expect to be called.
-            def run_job_sync(*job_args, **job_kwargs):
-                # self_recordset is the applicant record
-                real_method = getattr(self_recordset, '_run_gemini_extraction_job')
-                # Run the real method with the captured arguments
-                return real_method(*job_args, **job_kwargs)
-
-            mock_delay_obj._run_gemini_extraction_job = MagicMock(side_effect=run_job_sync)
-            return mock_delay_obj
-
-        self.delay_patcher = patch.object(
-            type(self.env['hr.applicant']), 
-            'with_delay',
-            new=mock_with_delay,
-        )
-        self.delay_patcher.start()
- 
-        # 3. Patch the bus notification
-        self.bus_patcher = patch.object(
-            type(self.env['bus.bus']), 
-            '_sendone', 
-            MagicMock(return_value=True)
-        )
-        self.mock_bus_sendone = self.bus_patcher.start()
+        # 2. Drop Gemini models configured by previous tests, so that
+        # each test builds its model from its own mocks.
+        _get_gemini_model.cache_clear()
 
-    def tearDown(self):
-        """Stop the patchers after each test."""
-        self.bus_patcher.stop()
-        self.delay_patcher.stop()
-        self.commit_patcher.stop()
-        self.rollback_patcher.stop()
-        super().tearDown()
+    def _make_gemini_mock(self, text=None, exc=None):
+        """
+        Returns a mocked `genai.GenerativeModel` constructor and the model it
+        builds, whose `generate_content` returns `text` or raises `exc`.
+        """
+        mock_gemini_model = MagicMock(spec_set=['generate_content', '_client'])
+        if exc is not None:
+            mock_gemini_model.generate_content.side_effect = exc
+        else:
+            mock_api_response = MagicMock(spec_set=['text'])
+            mock_api_response.text = text
+            mock_gemini_model.generate_content.return_value = mock_api_response
+        return MagicMock(return_value=mock_gemini_model), mock_gemini_model
+
+    def _assert_bus_notification(self, notification_type, message_part):
+        """Checks the single bus notification sent to the user."""
+        self.mock_bus_sendone.assert_called_once()
+        _partner, channel, payload = self.mock_bus_sendone.call_args[0]
+        self.assertEqual(channel, 'simple_notification')
+        self.assertEqual(payload['type'], notification_type)
+        self.assertIn(message_part, payload['message'])
 
     def test_01_successful_extraction(self):
         """
         Test a full, successful extraction and data writing.
         """
         # 1. Setup Mocks for Gemini API
-        mock_api_response = MagicMock()
-        mock_api_response.text = json.dumps(MOCK_GEMINI_RESPONSE_JSON)
-        
-        mock_gemini_model = MagicMock()
-        mock_gemini_model.generate_content.return_value = mock_api_response
-        
-        mock_gemini_constructor = MagicMock(return_value=mock_gemini_model)
-
-        # 2. Setup Mocks for Odoo ORM (to find skills, degrees, etc.)
-        # Create REAL records for the test to find.
-        real_degree = self.env['hr.recruitment.degree'].create({
-            'name': "Bachelor's Degree in Computer Science"
-        })
-        skill_type_prog = self.env['hr.skill.type'].create({'name': 'Programming Languages'})
-        skill_type_lang = self.env['hr.skill.type'].create({'name': 'Languages'})
-        skill_level_adv = self.env['hr.skill.level'].create({'name': 'Advanced', 'level_progress': 80})
-        skill_level_c1 = self.env['hr.skill.level'].create({'name': 'C1', 'level_progress': 85})
-        real_skill_py = self.env['hr.skill'].create({'name': 'Python', 'skill_type_id': skill_type_prog.id})
-        real_skill_en = self.env['hr.skill'].create({'name': 'English', 'skill_type_id': skill_type_lang.id})
-
-        # We patch the `search` method of each model to return the
-        # correct recordset based on the search domain.
-        degree_model = self.env['hr.recruitment.degree']
-        orig_degree_search = degree_model.search
-        def mock_degree_search(domain, *args, **kwargs):
-            if domain == [('name', '=ilike', "Bachelor's Degree in Computer Science")]:
-                return real_degree
-            return orig_degree_search(domain, *args, **kwargs)
-
-        skill_type_model = self.env['hr.skill.type']
-        orig_skill_type_search = skill_type_model.search
-        def mock_skill_type_search(domain, *args, **kwargs):
-            if domain == [('name', '=ilike', 'Programming Languages')]:
-                return skill_type_prog
-            if domain == [('name', '=ilike', 'Languages')]:
-                return skill_type_lang
-            return orig_skill_type_search(domain, *args, **kwargs)
-
-        skill_level_model = self.env['hr.skill.level']
-        orig_skill_level_search = skill_level_model.search
-        def mock_skill_level_search(domain, *args, **kwargs):
-            # Use domain[0] as search can be complex
-            name_domain = domain[0]
-            if name_domain == ('name', '=ilike', 'Advanced'):
-                return skill_level_adv
-            if name_domain == ('name', '=ilike', 'C1'):
-                return skill_level_c1
-            # Handle default level search
-            if name_domain == ('name', '=ilike', 'Beginner'):
-                return self.env['hr.skill.level'].search(domain, *args, **kwargs)
-            return orig_skill_level_search(domain, *args, **kwargs)
-
-        skill_model = self.env['hr.skill']
-        orig_skill_search = skill_model.search
-        def mock_skill_search(domain, *args, **kwargs):
-            if domain == [('name', '=ilike', 'Python')]:
-                return real_skill_py
-            if domain == [('name', '=ilike', 'English')]:
-                return real_skill_en
-            return orig_skill_search(domain, *args, **kwargs)
-
-        # Mock applicant skill search to always return empty, forcing creation
-        applicant_skill_model = self.env['hr.applicant.skill']
-        mock_app_skill_search = MagicMock(return_value=applicant_skill_model.browse([]))
-
-        # 3. Patch the `genai.GenerativeModel` client and all relevant search methods
+        mock_gemini_constructor, mock_gemini_model = self._make_gemini_mock(text=MOCK_GEMINI_RESPONSE_TEXT)
+
+        # 2. The extracted degree and skills are looked up for real: they
+        # match the records of `setUpClass`, so none is created.
+        name_domains = {
+            'hr.recruitment.degree': [('name', '=', "Bachelor's Degree in Computer Science")],
+        }
+        if self.with_skills:
+            name_domains.update({
+                'hr.skill.type': [('name', 'in', ['Programming Languages', 'Languages'])],
+                'hr.skill.level': [('name', 'in', ['Advanced', 'C1'])],
+                'hr.skill': [('name', 'in', ['Python', 'English'])],
+            })
+        counts_before = {
+            model_name: self.env[model_name].search_count(domain)
+            for model_name, domain in name_domains.items()
+        }
+
+        # Patch the `genai.GenerativeModel` client
         with patch('odoo.addons.hr_recruitment_extract_gemini.models.hr_applicant.genai.GenerativeModel', mock_gemini_constructor), \
-             patch('odoo.addons.hr_recruitment_extract_gemini.models.hr_applicant.genai.configure') as mock_genai_configure, \
-             patch.object(type(degree_model), 'search', side_effect=mock_degree_search) as mock_degree_search_patch, \
-             patch.object(type(skill_type_model), 'search', side_effect=mock_skill_type_search), \
-             patch.object(type(skill_level_model), 'search', side_effect=mock_skill_level_search), \
-             patch.object(type(skill_model), 'search', side_effect=mock_skill_search), \
-             patch.object(type(applicant_skill_model), 'search', mock_app_skill_search):
-            
-            # 4. Run the action
+             patch('odoo.addons.hr_recruitment_extract_gemini.models.hr_applicant.genai.configure') as mock_genai_configure:
+
+            # 3. Run the action
             self.applicant.action_extract_with_gemini()
             
-            # 5. Check if the API was called correctly
+            # 4. Check if the API was called correctly
             mock_genai_configure.assert_called_once_with(api_key='fake_api_key')
-            mock_gemini_constructor.assert_called_once_with('fake-model-name')
+            # Check that structured JSON output is requested
+            mock_gemini_constructor.assert_called_once_with(
+                'fake-model-name', generation_config=GEMINI_CV_GENERATION_CONFIG
+            )
             mock_gemini_model.generate_content.assert_called_once()
             
             call_args = mock_gemini_model.generate_content.call_args[0][0]
@@ -237,160 +237,392 @@ class TestHrApplicantGemini(TransactionCase):
             # Check prompt and file blob
             self.assertEqual(call_args[0], GEMINI_CV_EXTRACTION_PROMPT_FILE)
             self.assertEqual(call_args[1]['mime_type'], 'application/pdf')
-            self.assertEqual(call_args[1]['data'], self.attachment_datas)
-
-
-            # 6. Check applicant state
-            self.assertEqual(self.applicant.gemini_extract_state, 'done')
-            self.assertEqual(self.applicant.gemini_extract_status, 'Successfully extracted data.')
-
-            # 7. Check simple fields
-            self.assertEqual(self.applicant.partner_name, 'John Doe')
-            self.assertEqual(self.applicant.name, "John Doe's Application")
-            self.assertEqual(self.applicant.email_from, 'john.doe@example.com')
-            self.assertEqual(self.applicant.partner_phone, '123-456-7890')
-            self.assertEqual(self.applicant.linkedin_profile, 'https://linkedin.com/in/johndoe')
-
-            # 8. Check created degree
-            mock_degree_search_patch.assert_called_with(
-                [('name', '=ilike', "Bachelor's Degree in Computer Science")], limit=1
-            )
-            self.assertEqual(self.applicant.type_id.id, real_degree.id)
+            self.assertEqual(call_args[1]['data'], MOCK_CV_CONTENT)
+
+
+            # 6-8. Check applicant state, simple fields and degree
+            self.assertRecordValues(self.applicant, [{
+                'gemini_extract_state': 'done',
+                'gemini_extract_status': 'Successfully extracted data.',
+                'partner_name': 'John Doe',
+                'name': "John Doe's Application",
+                'email_from': 'john.doe@example.com',
+                'partner_phone': '123-456-7890',
+                'linkedin_profile': 'https://linkedin.com/in/johndoe',
+                'type_id': self.real_degree.id,
+            }])
+            self.assertEqual({
+                model_name: self.env[model_name].search_count(domain)
+                for model_name, domain in name_domains.items()
+            }, counts_before)
             
             # 9. Check created skills
-            applicant_skills = self.applicant.applicant_skill_ids
-            self.assertEqual(len(applicant_skills), 2)
-            
-            python_skill = applicant_skills.filtered(lambda s: s.skill_id.name == 'Python')
-            self.assertTrue(python_skill)
-            self.assertEqual(python_skill.skill_type_id.name, 'Programming Languages')
-            self.assertEqual(python_skill.skill_level_id.name, 'Advanced')
-            self.assertEqual(python_skill.skill_level_id.level_progress, 80)
+            if self.with_skills:
+                # Read all the links in one query, indexed by skill
+                rows = self.env['hr.applicant.skill'].search_read(
+                    [('applicant_id', '=', self.applicant.id)],
+                    ['skill_id', 'skill_type_id', 'skill_level_id'],
+                )
+                rows_by_skill = {row['skill_id'][0]: row for row in rows}
+                self.assertCountEqual(rows_by_skill, [self.real_skill_py.id, self.real_skill_en.id])
+
+                python_skill = rows_by_skill[self.real_skill_py.id]
+                self.assertEqual(python_skill['skill_type_id'][0], self.skill_type_prog.id)
+                self.assertEqual(python_skill['skill_level_id'][0], self.skill_level_adv.id) # Advanced (80%)
             
-            english_skill = applicant_skills.filtered(lambda s: s.skill_id.name == 'English')
-            self.assertTrue(english_skill)
-            self.assertEqual(english_skill.skill_type_id.name, 'Languages')
-            self.assertEqual(english_skill.skill_level_id.name, 'C1')
-            self.assertEqual(english_skill.skill_level_id.level_progress, 85)
+                english_skill = rows_by_skill[self.real_skill_en.id]
+                self.assertEqual(english_skill['skill_type_id'][0], self.skill_type_lang.id)
+                self.assertEqual(english_skill['skill_level_id'][0], self.skill_level_c1.id) # C1 (85%)
             
             # 10. Check for bus notification
-            self.mock_bus_sendone.assert_called_once()
-            call_args = self.mock_bus_sendone.call_args[0]
-            self.assertEqual(call_args[1], 'simple_notification') # Check channel
-            self.assertEqual(call_args[2]['type'], 'success') # Check type
-            self.assertIn("Successfully extracted", call_args[2]['message'])
-
-
-    def test_02_api_call_failure(self):
-        """
-        Test how the system handles a direct exception from the API call.
-        """
-        # 1. Setup Mock to raise an error
-        mock_gemini_model = MagicMock()
-        mock_gemini_model.generate_content.side_effect = Exception(MOCK_GEMINI_RESPONSE_ERROR)
-        mock_gemini_constructor = MagicMock(return_value=mock_gemini_model)
-
+            self._assert_bus_notification('success', "Successfully extracted")
 
-        # 2. Patch the client
-        with patch('odoo.addons.hr_recruitment_extract_gemini.models.hr_applicant.genai.GenerativeModel', mock_gemini_constructor), \
-             patch('odoo.addons.hr_recruitment_extract_gemini.models.hr_applicant.genai.configure'):
-            
-            # 3. Run the action
-            self.applicant.action_extract_with_gemini()
-            
-            # 4. Check state
-            self.assertEqual(self.applicant.gemini_extract_state, 'error')
-            self.assertIn(MOCK_GEMINI_RESPONSE_ERROR, self.applicant.gemini_extract_status)
-            self.assertEqual(self.applicant.partner_name, False)
-            
-            # 5. Check for bus notification
-            self.mock_bus_sendone.assert_called_once()
-            call_args = self.mock_bus_sendone.call_args[0]
-            self.assertEqual(call_args[1], 'simple_notification') # Check channel
-            self.assertEqual(call_args[2]['type'], 'warning') # Check type
-            self.assertIn("Failed to extract", call_args[2]['message'])
-
-    def test_03_invalid_json_response(self):
-        """
-        Test how the system handles a response that is not valid JSON.
-        """
-        # 1. Setup Mock to return invalid JSON
-        mock_api_response = MagicMock()
-        mock_api_response.text = MOCK_GEMINI_RESPONSE_INVALID_JSON
-        
-        mock_gemini_model = MagicMock()
-        mock_gemini_model.generate_content.return_value = mock_api_response
-        mock_gemini_constructor = MagicMock(return_value=mock_gemini_model)
-        
-        # 2. Patch the client
-        with patch('odoo.addons.hr_recruitment_extract_gemini.models.hr_applicant.genai.GenerativeModel', mock_gemini_constructor), \
-             patch('odoo.addons.hr_recruitment_extract_gemini.models.hr_applicant.genai.configure'):
 
-            # 3. Run the action
-            self.applicant.action_extract_with_gemini()
-            
-            # 4. Check state
-            self.assertEqual(self.applicant.gemini_extract_state, 'error')
-            self.assertIn("invalid response that could not be parsed", self.applicant.gemini_extract_status)
-            self.assertIn(MOCK_GEMINI_RESPONSE_INVALID_JSON, self.applicant.gemini_extract_status)
-            self.assertEqual(self.applicant.partner_name, False)
-
-            # 5. Check for bus notification
-            self.mock_bus_sendone.assert_called_once()
-            call_args = self.mock_bus_sendone.call_args[0]
-            self.assertEqual(call_args[1], 'simple_notification') # Check channel
-            self.assertEqual(call_args[2]['type'], 'warning') # Check type
-            self.assertIn("invalid response", call_args[2]['message'])
-
-    def test_04_no_api_key(self):
+    def test_02_extraction_failures(self):
         """
-        Test that the extraction fails if the API key is not set.
+        Test how the system handles an exception from the API call, a
+        response that is not valid JSON and a missing API key.
         """
-        # 1. Set bad config
-        self.env.company.gemini_api_key = False
-        
-        # 2. Run the action
-        self.applicant.action_extract_with_gemini()
-        
-        # 3. Check state
-        self.assertEqual(self.applicant.gemini_extract_state, 'error')
-        self.assertIn("API Key is not set", self.applicant.gemini_extract_status)
-
-        # 4. Check for bus notification
-        self.mock_bus_sendone.assert_called_once()
-        call_args = self.mock_bus_sendone.call_args[0]
-        self.assertEqual(call_args[1], 'simple_notification') # Check channel
-        self.assertEqual(call_args[2]['type'], 'warning') # Check type
-        self.assertIn("API Key is not set", call_args[2]['message'])
+        # (name, company values, Gemini mock, expected status parts, expected notification)
+        cases = [
+            ('api_call_failure', {}, {'exc': Exception(MOCK_GEMINI_RESPONSE_ERROR)},
+             [MOCK_GEMINI_RESPONSE_ERROR], "Failed to extract"),
+            ('invalid_json_response', {}, {'text': MOCK_GEMINI_RESPONSE_INVALID_JSON},
+             ["invalid response that could not be parsed", MOCK_GEMINI_RESPONSE_INVALID_JSON], "invalid response"),
+            ('no_api_key', {'gemini_api_key': False}, {'text': MOCK_GEMINI_RESPONSE_TEXT},
+             ["API Key is not set"], "API Key is not set"),
+        ]
+        for name, company_vals, mock_kwargs, status_parts, message_part in cases:
+            with self.subTest(name=name), self.env.cr.savepoint() as savepoint:
+                self.mock_bus_sendone.reset_mock()
+                _get_gemini_model.cache_clear()
+
+                # 1. Set the config and the Gemini mock of this case
+                if company_vals:
+                    self.env.company.write(company_vals)
+                mock_gemini_constructor, _mock_gemini_model = self._make_gemini_mock(**mock_kwargs)
+
+                # 2. Run the action with the patched client
+                with patch('odoo.addons.hr_recruitment_extract_gemini.models.hr_applicant.genai.GenerativeModel', mock_gemini_constructor), \
+                     patch('odoo.addons.hr_recruitment_extract_gemini.models.hr_applicant.genai.configure'):
+                    self.applicant.action_extract_with_gemini()
+
+                # 3. Check state
+                self.assertEqual(self.applicant.gemini_extract_state, 'error')
+                for status_part in status_parts:
+                    self.assertIn(status_part, self.applicant.gemini_extract_status)
+                self.assertEqual(self.applicant.partner_name, False)
+
+                # 4. Check for bus notification
+                self._assert_bus_notification('warning', message_part)
+
+                # Undo this case's changes before the next one
+                savepoint.rollback()
+                self.env.invalidate_all()
 
     def test_05_can_extract_with_gemini_compute(self):
         """
         Test the logic of the `can_extract_with_gemini` compute field.
         """
+        # Each case changes the applicant and the company with one write each
         # 1. Correct state: manual mode, attachment, valid state
-        self.env.company.gemini_cv_extract_mode = 'manual_send'
-        self.applicant.message_main_attachment_id = self.attachment
-        self.applicant.gemini_extract_state = 'no_extract'
+        self.env.company.write({'gemini_cv_extract_mode': 'manual_send'})
+        self.applicant.write({
+            'message_main_attachment_id': self.attachment.id,
+            'gemini_extract_state': 'no_extract',
+        })
         self.assertTrue(self.applicant.can_extract_with_gemini)
         
         # 2. Test 'done' state (should allow retry)
-        self.applicant.gemini_extract_state = 'done'
+        self.applicant.write({'gemini_extract_state': 'done'})
         self.assertTrue(self.applicant.can_extract_with_gemini)
         
         # 3. Test 'error' state (should allow retry)
-        self.applicant.gemini_extract_state = 'error'
+        self.applicant.write({'gemini_extract_state': 'error'})
         self.assertTrue(self.applicant.can_extract_with_gemini)
 
         # 4. Wrong mode (no_send)
-        self.env.company.gemini_cv_extract_mode = 'no_send'
+        self.env.company.write({'gemini_cv_extract_mode': 'no_send'})
         self.assertFalse(self.applicant.can_extract_with_gemini)
         
         # 5. Wrong state (processing)
-        self.env.company.gemini_cv_extract_mode = 'manual_send'
-        self.applicant.gemini_extract_state = 'processing'
+        self.env.company.write({'gemini_cv_extract_mode': 'manual_send'})
+        self.applicant.write({'gemini_extract_state': 'processing'})
         self.assertFalse(self.applicant.can_extract_with_gemini)
         
         # 6. No attachment
-        self.applicant.gemini_extract_state = 'no_extract'
-        self.applicant.message_main_attachment_id = False
-        self.assertFalse(self.applicant.can_extract_with_gemini)
\ No newline at end of file
+        self.applicant.write({
+            'gemini_extract_state': 'no_extract',
+            'message_main_attachment_id': False,
+        })
+        self.assertFalse(self.applicant.can_extract_with_gemini)
+
+    def test_06_duplicate_cv_uses_cache(self):
+        """
+        Test that re-extracting an identical CV is served from the
+        extraction cache instead of calling the Gemini API again.
+        """
+        # 1. Setup Mocks for Gemini API
+        mock_gemini_constructor, mock_gemini_model = self._make_gemini_mock(text=MOCK_GEMINI_RESPONSE_TEXT)
+
+        # 2. Run the extraction twice on the same CV
+        with patch('odoo.addons.hr_recruitment_extract_gemini.models.hr_applicant.genai.GenerativeModel', mock_gemini_constructor), \
+             patch('odoo.addons.hr_recruitment_extract_gemini.models.hr_applicant.genai.configure'):
+
+            self.applicant.action_extract_with_gemini()
+            self.applicant.action_extract_with_gemini()
+
+        # 3. The API was only called for the first run
+        mock_gemini_model.generate_content.assert_called_once()
+
+        # 4. The second run still wrote the extracted data
+        self.assertEqual(self.applicant.gemini_extract_state, 'done')
+        self.assertEqual(self.applicant.partner_name, 'John Doe')
+        self.assertEqual(self.mock_bus_sendone.call_count, 2)
+
+    def test_07_batch_extraction(self):
+        """
+        Test that extracting several applicants at once runs them in a
+        single batch job and sends a single notification.
+        """
+        # 1. Create a second applicant with its own CV
+        applicant_2 = self.env['hr.applicant'].create({
+            'name': "Second Applicant's Application",
+        })
+        attachment_2 = self.env['ir.attachment'].create({
+            'name': 'second_cv.pdf',
+            'datas': MOCK_CV_2_DATAS,
+            'mimetype': 'application/pdf',
+            'res_model': 'hr.applicant',
+            'res_id': applicant_2.id,
+        })
+        applicant_2.message_main_attachment_id = attachment_2.id
+        applicants = self.applicant + applicant_2
+
+        # 2. Setup Mocks for Gemini API: the second CV fails
+        mock_gemini_constructor, mock_gemini_model = self._make_gemini_mock(text=MOCK_GEMINI_RESPONSE_TEXT)
+        mock_api_response = mock_gemini_model.generate_content.return_value
+
+        # The calls run concurrently, so answer by CV instead of by call order
+        def mock_generate_content(contents):
+            if contents[1]['data'] == MOCK_CV_2_CONTENT:
+                raise Exception(MOCK_GEMINI_RESPONSE_ERROR)
+            return mock_api_response
+
+        mock_gemini_model.generate_content.side_effect = mock_generate_content
+
+        # 3. Run the action on both applicants
+        with patch('odoo.addons.hr_recruitment_extract_gemini.models.hr_applicant.genai.GenerativeModel', mock_gemini_constructor), \
+             patch('odoo.addons.hr_recruitment_extract_gemini.models.hr_applicant.genai.configure'):
+
+            applicants.action_extract_with_gemini()
+
+        # 4. Check states
+        self.assertEqual(mock_gemini_model.generate_content.call_count, 2)
+        self.assertEqual(self.applicant.gemini_extract_state, 'done')
+        self.assertEqual(self.applicant.partner_name, 'John Doe')
+        self.assertEqual(applicant_2.gemini_extract_state, 'error')
+        self.assertIn(MOCK_GEMINI_RESPONSE_ERROR, applicant_2.gemini_extract_status)
+
+        # 5. Check for a single aggregated bus notification
+        self._assert_bus_notification('warning', "Processed 2 CVs: 1 extracted, 1 failed")
+
+    def test_08_pdf_text_sent_instead_of_file(self):
+        """
+        Test that the extracted text of a PDF CV is sent to Gemini
+        instead of the file itself.
+        """
+        # 1. Setup Mocks for Gemini API and the local text extraction
+        mock_gemini_constructor, mock_gemini_model = self._make_gemini_mock(text=MOCK_GEMINI_RESPONSE_TEXT)
+
+        # 2. Run the action
+        with patch('odoo.addons.hr_recruitment_extract_gemini.models.hr_applicant.genai.GenerativeModel', mock_gemini_constructor), \
+             patch('odoo.addons.hr_recruitment_extract_gemini.models.hr_applicant.genai.configure'), \
+             patch.object(self.Applicant, '_extract_text_from_pdf', return_value='John Doe CV text'):
+
+            self.applicant.action_extract_with_gemini()
+
+        # 3. Check that the text was sent
+        call_args = mock_gemini_model.generate_content.call_args[0][0]
+        self.assertEqual(call_args[0], GEMINI_CV_EXTRACTION_PROMPT_FILE)
+        self.assertEqual(call_args[1], 'John Doe CV text')
+        self.assertEqual(self.applicant.gemini_extract_state, 'done')
+
+    def test_09_duplicate_cvs_extracted_once(self):
+        """
+        Test that identical CVs (same checksum) extracted together
+        are sent to Gemini only once, unless their companies use different
+        Gemini settings.
+        """
+        # 1. Create a copy of the CV on another attachment
+        duplicate_attachment = self.env['ir.attachment'].create({
+            'name': 'duplicate_cv.pdf',
+            'datas': MOCK_CV_DATAS,
+            'mimetype': 'application/pdf',
+        })
+        self.assertEqual(duplicate_attachment.checksum, self.attachment.checksum)
+
+        # 2. Setup Mocks for Gemini API
+        mock_gemini_constructor, mock_gemini_model = self._make_gemini_mock(text=MOCK_GEMINI_RESPONSE_TEXT)
+
+        # 3. Extract both CVs at once
+        with patch('odoo.addons.hr_recruitment_extract_gemini.models.hr_applicant.genai.GenerativeModel', mock_gemini_constructor), \
+             patch('odoo.addons.hr_recruitment_extract_gemini.models.hr_applicant.genai.configure'):
+
+            results = self.env['hr.applicant']._gemini_extract_cvs_data(
+                self.attachment + duplicate_attachment
+            )
+
+        # 4. Gemini was called once and both CVs got the result
+        mock_gemini_model.generate_content.assert_called_once()
+        self.assertEqual(results[self.attachment.id], MOCK_GEMINI_RESPONSE_JSON)
+        self.assertEqual(results[duplicate_attachment.id], MOCK_GEMINI_RESPONSE_JSON)
+
+        # 5. The same CV of a company with another API key gets its own call
+        other_company = self.env['res.company'].create({
+            'name': 'Other Company',
+            'gemini_api_key': 'other_api_key',
+            'gemini_model': 'fake-model-name',
+        })
+        other_company_attachment = self.env['ir.attachment'].create({
+            'name': 'other_company_cv.pdf',
+            'datas': MOCK_CV_DATAS,
+            'mimetype': 'application/pdf',
+            'company_id': other_company.id,
+        })
+        mock_gemini_model.generate_content.reset_mock()
+        with patch('odoo.addons.hr_recruitment_extract_gemini.models.hr_applicant.genai.GenerativeModel', mock_gemini_constructor), \
+             patch('odoo.addons.hr_recruitment_extract_gemini.models.hr_applicant.genai.configure'), \
+             patch.object(self.Applicant, '_gemini_get_cached_cv_data', return_value=None):
+
+            self.env['hr.applicant']._gemini_extract_cvs_data(
+                self.attachment + other_company_attachment
+            )
+
+        self.assertEqual(mock_gemini_model.generate_content.call_count, 2)
+
+    def test_10_models_bound_to_their_api_key(self):
+        """
+        Test that the cached models of two API keys keep calling Gemini
+        with their own key, whichever key was configured last.
+        """
+        # 1. Each default client is built from the last configured key
+        configured = {}
+        clients = {'key_a': MagicMock(), 'key_b': MagicMock()}
+
+        def mock_configure(api_key):
+            configured['api_key'] = api_key
+
+        def mock_get_default_generative_client():
+            return clients[configured['api_key']]
+
+        file_clients = {'key_a': MagicMock(), 'key_b': MagicMock()}
+
+        def mock_get_default_file_client():
+            return file_clients[configured['api_key']]
+
+        with patch('odoo.addons.hr_recruitment_extract_gemini.models.hr_applicant.genai.configure', side_effect=mock_configure), \
+             patch('odoo.addons.hr_recruitment_extract_gemini.models.hr_applicant.genai_client.get_default_file_client',
+                   side_effect=mock_get_default_file_client), \
+             patch('odoo.addons.hr_recruitment_extract_gemini.models.hr_applicant.file_types.File'), \
+             patch('odoo.addons.hr_recruitment_extract_gemini.models.hr_applicant.genai_client.get_default_generative_client',
+                   side_effect=mock_get_default_generative_client):
+
+            # 2. Build the models of both keys, then configure the first
+            # key again, as an upload does
+            model_a = _get_gemini_model('key_a', 'fake-model-name')
+            model_b = _get_gemini_model('key_b', 'fake-model-name')
+            self.addCleanup(_gemini_uploaded_files.pop, ('key_a', 'checksum'), None)
+            self.addCleanup(_get_gemini_file_client.cache_clear)
+            _gemini_upload_file('key_a', 'checksum', MOCK_CV_CONTENT, 'application/pdf', 'test_cv.pdf')
+
+        # 3. Each model keeps the client of its own key
+        self.assertEqual(configured['api_key'], 'key_a')
+        self.assertIs(model_a._client, clients['key_a'])
+        self.assertIs(model_b._client, clients['key_b'])
+        self.assertIs(_get_gemini_model('key_b', 'fake-model-name'), model_b)
+        # 4. The file was uploaded with the client of its own key
+        file_clients['key_a'].create_file.assert_called_once()
+        file_clients['key_b'].create_file.assert_not_called()
+
+    def test_11_repaired_response_must_match_schema(self):
+        """
+        Test that a malformed response repaired into JSON is only accepted
+        if it has the shape of the extraction schema.
+        """
+        Applicant = self.env['hr.applicant']
+        cases = [
+            ('garbage', {'name': 'test'}, None),
+            ('wrong_types', {'name': ['test'], 'skills': []}, None),
+            ('cv_data', MOCK_GEMINI_RESPONSE_JSON, MOCK_GEMINI_RESPONSE_JSON),
+        ]
+        for name, repaired, expected in cases:
+            with self.subTest(name=name), \
+                 patch('odoo.addons.hr_recruitment_extract_gemini.models.hr_applicant.json_repair') as mock_json_repair:
+                mock_json_repair.loads.return_value = repaired
+                if expected is None:
+                    with self.assertRaises(UserError):
+                        Applicant._parse_gemini_response(MOCK_GEMINI_RESPONSE_INVALID_JSON)
+                else:
+                    self.assertEqual(Applicant._parse_gemini_response(MOCK_GEMINI_RESPONSE_INVALID_JSON), expected)
+
+    def test_12_extraction_without_skills(self):
+        """
+        Test an extraction when 'hr_recruitment_skills' is not installed:
+        the simple fields are written and the skills are ignored.
+        """
+        # 1. Setup Mocks for Gemini API
+        mock_gemini_constructor, _mock_gemini_model = self._make_gemini_mock(text=MOCK_GEMINI_RESPONSE_TEXT)
+
+        # 2. Run the action with the applicant skills model hidden from the registry
+        def mock_contains(env, model_name):
+            return model_name != 'hr.applicant.skill' and model_name in env.registry
+
+        with patch('odoo.addons.hr_recruitment_extract_gemini.models.hr_applicant.genai.GenerativeModel', mock_gemini_constructor), \
+             patch('odoo.addons.hr_recruitment_extract_gemini.models.hr_applicant.genai.configure'), \
+             patch.object(Environment, '__contains__', mock_contains), \
+             patch.object(self.Applicant, '_process_skills') as mock_process_skills:
+
+            self.applicant.action_extract_with_gemini()
+
+        # 3. The simple fields were written, the skills were not processed
+        mock_process_skills.assert_not_called()
+        self.assertRecordValues(self.applicant, [{
+            'gemini_extract_state': 'done',
+            'gemini_extract_status': 'Successfully extracted data.',
+            'partner_name': 'John Doe',
+            'email_from': 'john.doe@example.com',
+            'type_id': self.real_degree.id,
+        }])
+        self._assert_bus_notification('success', "Successfully extracted")
+
+    def test_13_batch_extraction_critical_error(self):
+        """
+        Test that an unexpected error of a batch job marks its applicants
+        as failed and still notifies the user.
+        """
+        with patch.object(self.Applicant, '_gemini_extract_cvs_data', side_effect=RuntimeError("Unexpected failure")):
+            self.applicant._run_gemini_batch_extraction_job(self.env.user.id)
+
+        self.assertEqual(self.applicant.gemini_extract_state, 'error')
+        self.assertIn("Unexpected failure", self.applicant.gemini_extract_status)
+        self._assert_bus_notification('warning', "Critical Job Failure")
+
+    def test_14_default_skill_level_not_found_in_cache(self):
+        """
+        Test that a deleted default skill level is replaced by another one
+        without clearing the whole registry cache.
+        """
+        if not self.with_skills:
+            self.skipTest("'hr_recruitment_skills' is not installed.")
+
+        default_level = self.env['hr.applicant']._get_default_skill_level()
+        self.assertEqual(default_level.name, 'Beginner')
+
+        default_level.unlink()
+        with patch.object(type(self.env.registry), 'clear_cache') as mock_clear_cache:
+            new_level = self.env['hr.applicant']._get_default_skill_level()
+
+        mock_clear_cache.assert_not_called()
+        self.assertTrue(new_level.exists())
+        self.assertNotEqual(new_level, default_level)
@@ -44,17 +44,6 @@ class TestHrJobBulkGemini(TransactionCase):
     def setUpClass(cls):
         super().setUpClass()
 
-        # Mock the check for hr_recruitment_skills being installed
-        mock_module = MagicMock()
-        mock_module.state = 'installed'
-        
-        cls.mock_get_patcher = patch.object(
-            type(cls.env['ir.module.module']), 
-            '_get', 
-            MagicMock(return_value=mock_module)
-        )
-        cls.mock_get_patcher.start()
-
         cls.job = cls.env['hr.job'].create({
             'name': 'Test Bulk Import Job (Gemini)',
         })
@@ -72,32 +61,34 @@ class TestHrJobBulkGemini(TransactionCase):
         
         cls.job.cv_attachment_ids = [(6, 0, [cls.attachment_1.id, cls.attachment_2.id])]
 
+        # Returned by the mocked `hr.applicant.create`, created before it is patched
+        cls.applicant_jane, cls.applicant_mike = cls.env['hr.applicant'].create([
+            {'name': "Jane Smith's Application"},
+            {'name': "Mike Johnson's Application"},
+        ])
+
         cls.env.company.write({
             'gemini_cv_extract_mode': 'manual_send',
             'gemini_api_key': 'fake_api_key',
             'gemini_model': 'fake-model-name',
         })
         
-        # Pre-create skill-related data
-        cls.env['hr.skill.level'].create({
-            'name': 'Beginner',
-            'level_progress': 15,
-        })
+        # Pre-create skill-related data ('hr_recruitment_skills' is optional)
+        if 'hr.skill.level' in cls.env:
+            cls.env['hr.skill.level'].create({
+                'name': 'Beginner',
+                'level_progress': 15,
+            })
         cls.env['hr.recruitment.degree'].create({'name': "Master's in Marketing"})
         cls.env['hr.recruitment.degree'].create({'name': 'PhD in Data Science'})
 
-    @classmethod
-    def tearDownClass(cls):
-        super().tearDownClass()
-        cls.mock_get_patcher.stop()
-
     def setUp(self):
         super().setUp()
 
-        # 1. Patch commits/rollbacks
-        self.commit_patcher = patch('odoo.sql_db.Cursor.commit', lambda *args, **kwargs: None)
+        # 1. Patch commits/rollbacks of the test cursor only
+        self.commit_patcher = patch.object(self.env.cr, 'commit', lambda *args, **kwargs: None)
         self.commit_patcher.start()
-        self.rollback_patcher = patch('odoo.sql_db.Cursor.rollback', lambda *args, **kwargs: None)
+        self.rollback_patcher = patch.object(self.env.cr, 'rollback', lambda *args, **kwargs: None)
         self.rollback_patcher.start()
 
         # 2. Patch `with_delay()` to run the job synchronously
@@ -129,13 +120,13 @@ class TestHrJobBulkGemini(TransactionCase):
         )
         self.mock_bus_sendone = self.bus_patcher.start()
 
-        # 4. Patch the `_gemini_call_for_cv` to return different responses
+        # 4. Patch the `_gemini_extract_cvs_data` to return different results
         # We will set this up inside each test
-        self.mock_gemini_call_patcher = patch.object(
+        self.mock_gemini_extract_patcher = patch.object(
             type(self.env['hr.applicant']),
-            '_gemini_call_for_cv'
+            '_gemini_extract_cvs_data'
         )
-        self.mock_gemini_call = self.mock_gemini_call_patcher.start()
+        self.mock_gemini_extract = self.mock_gemini_extract_patcher.start()
 
         # 5. Patch `hr.applicant.create` to avoid complex dependencies
         # We need to test *what* is sent to create, not the create itself
@@ -156,7 +147,7 @@ class TestHrJobBulkGemini(TransactionCase):
     def tearDown(self):
         self.mock_process_data_patcher.stop()
         self.mock_applicant_create_patcher.stop()
-        self.mock_gemini_call_patcher.stop()
+        self.mock_gemini_extract_patcher.stop()
         self.bus_patcher.stop()
         self.delay_patcher.stop()
         self.commit_patcher.stop()
@@ -167,19 +158,14 @@ class TestHrJobBulkGemini(TransactionCase):
         """Test a bulk process where all CVs are processed successfully."""
         
         # 1. Setup mocks
-        # Return Jane's data for the first call, Mike's for the second
-        self.mock_gemini_call.side_effect = [
-            json.dumps(MOCK_RESPONSE_JANE),
-            json.dumps(MOCK_RESPONSE_MIKE)
-        ]
+        # Return Jane's data for the first CV, Mike's for the second
+        self.mock_gemini_extract.return_value = {
+            self.attachment_1.id: MOCK_RESPONSE_JANE,
+            self.attachment_2.id: MOCK_RESPONSE_MIKE,
+        }
         
-        # Mock the return of the create method
-        mock_applicant_jane = self.env['hr.applicant'].browse([1])
-        mock_applicant_mike = self.env['hr.applicant'].browse([2])
-        self.mock_applicant_create.side_effect = [
-            mock_applicant_jane,
-            mock_applicant_mike
-        ]
+        # Mock the return of the create method (both applicants in one call)
+        self.mock_applicant_create.return_value = self.applicant_jane + self.applicant_mike
 
         # 2. Run the action
         self.job.action_process_cvs()
@@ -192,15 +178,11 @@ class TestHrJobBulkGemini(TransactionCase):
         self.assertEqual(self.job.processing_complete, True)
         self.assertEqual(self.job.processing_failed, False)
 
-        # 4. Check API calls
-        self.assertEqual(self.mock_gemini_call.call_count, 2)
-        self.mock_gemini_call.assert_any_call(self.attachment_1)
-        self.mock_gemini_call.assert_any_call(self.attachment_2)
+        # 4. Check that all CVs were extracted at once
+        self.mock_gemini_extract.assert_called_once_with(self.attachment_1 + self.attachment_2)
 
-        # 5. Check applicant creation calls
-        self.assertEqual(self.mock_applicant_create.call_count, 2)
-        
-        self.mock_applicant_create.assert_any_call({
+        # 5. Check that both applicants were created in a single call
+        self.mock_applicant_create.assert_called_once_with([{
             'name': "Jane Smith's Application",
             'partner_name': 'Jane Smith',
             'email_from': 'jane.smith@example.com',
@@ -208,8 +190,7 @@ class TestHrJobBulkGemini(TransactionCase):
             'job_id': self.job.id,
             'gemini_extract_state': 'done',
             'gemini_extract_status': _('Created from bulk import. Processing data...'),
-        })
-        self.mock_applicant_create.assert_any_call({
+        }, {
             'name': "Mike Johnson's Application",
             'partner_name': 'Mike Johnson',
             'email_from': 'mike.johnson@example.com',
@@ -217,7 +198,7 @@ class TestHrJobBulkGemini(TransactionCase):
             'job_id': self.job.id,
             'gemini_extract_state': 'done',
             'gemini_extract_status': _('Created from bulk import. Processing data...'),
-        })
+        }])
         
         # 6. Check data processing calls
         self.mock_process_data.assert_any_call(MOCK_RESPONSE_JANE)
@@ -238,14 +219,13 @@ class TestHrJobBulkGemini(TransactionCase):
         """Test a bulk process where one CV fails."""
 
         # 1. Setup mocks
-        # First call succeeds, second call raises an API error
-        self.mock_gemini_call.side_effect = [
-            json.dumps(MOCK_RESPONSE_JANE),
-            UserError("Test API Error on second CV")
-        ]
+        # First CV succeeds, second CV failed with an API error
+        self.mock_gemini_extract.return_value = {
+            self.attachment_1.id: MOCK_RESPONSE_JANE,
+            self.attachment_2.id: UserError("Test API Error on second CV"),
+        }
         
-        mock_applicant_jane = self.env['hr.applicant'].browse([1])
-        self.mock_applicant_create.return_value = mock_applicant_jane
+        self.mock_applicant_create.return_value = self.applicant_jane
 
         # 2. Run the action
         self.job.action_process_cvs()
@@ -258,13 +238,13 @@ class TestHrJobBulkGemini(TransactionCase):
         self.assertEqual(self.job.processing_complete, True)
         self.assertEqual(self.job.processing_failed, True)
 
-        # 4. Check API calls (should be 2)
-        self.assertEqual(self.mock_gemini_call.call_count, 2)
+        # 4. Check that all CVs were extracted at once
+        self.mock_gemini_extract.assert_called_once()
 
         # 5. Check applicant creation (should be 1)
         self.assertEqual(self.mock_applicant_create.call_count, 1)
         
-        self.mock_applicant_create.assert_called_with({
+        self.mock_applicant_create.assert_called_with([{
             'name': "Jane Smith's Application",
             'partner_name': 'Jane Smith',
             'email_from': 'jane.smith@example.com',
@@ -272,7 +252,7 @@ class TestHrJobBulkGemini(TransactionCase):
             'job_id': self.job.id,
             'gemini_extract_state': 'done',
             'gemini_extract_status': _('Created from bulk import. Processing data...'),
-        })
+        }])
 
         # 6. Check data processing (should be 1)
         self.mock_process_data.assert_called_once_with(MOCK_RESPONSE_JANE)
@@ -336,4 +316,31 @@ class TestHrJobBulkGemini(TransactionCase):
         # Check notification
         self.assertEqual(res['tag'], 'display_notification')
         self.assertEqual(res['params']['type'], 'success')
-        self.assertIn("2 attached CVs", res['params']['message'])
\ No newline at end of file
+        self.assertIn("2 attached CVs", res['params']['message'])
+
+    def test_05_bulk_process_extracts_per_commit_window(self):
+        """Test that the CVs are extracted one commit window at a time."""
+
+        # 1. Setup mocks: one CV per window, each extraction only returns its CVs
+        responses = {
+            self.attachment_1.id: MOCK_RESPONSE_JANE,
+            self.attachment_2.id: MOCK_RESPONSE_MIKE,
+        }
+        self.mock_gemini_extract.side_effect = lambda attachments: {
+            att_id: responses[att_id] for att_id in attachments.ids
+        }
+        self.mock_applicant_create.side_effect = [self.applicant_jane, self.applicant_mike]
+
+        # 2. Run the action
+        with patch('odoo.addons.hr_recruitment_extract_gemini.models.hr_job.GEMINI_BULK_COMMIT_INTERVAL', 1):
+            self.job.action_process_cvs()
+        self.job.invalidate_recordset()
+
+        # 3. Each window was extracted on its own, before its applicants were created
+        self.assertEqual(
+            [call.args[0] for call in self.mock_gemini_extract.call_args_list],
+            [self.attachment_1, self.attachment_2],
+        )
+        self.assertEqual(self.mock_applicant_create.call_count, 2)
+        self.assertFalse(self.job.processing_failed)
+        self.assertEqual(self.job.processed_cv_attachment_ids, self.attachment_1 + self.attachment_2)
@@ -7,6 +7,7 @@ from . import hr_job_requirement_tag
 # Parent models
 from . import hr_job
 from . import hr_applicant
+from . import hr_applicant_openai_cache
 
 # Child models (relations)
 from . import hr_job_requirement
@@ -1,13 +1,19 @@
 # -*- coding: utf-8 -*-
+import asyncio
+import functools
+import io
 import openai
 import json
 import logging
 import odoo
 import re
+import threading
+import time
 from collections import defaultdict
 from typing import List, Optional
-from odoo import api, fields, models, _
+from odoo import api, fields, models, tools, _
 from odoo.exceptions import UserError
+from odoo.osv import expression
 from pydantic import BaseModel, Field
 
 from .openai_prompts import (
@@ -19,6 +25,139 @@ from .openai_prompts import (
 
 _logger = logging.getLogger(__name__)
 
+try:
+    import pymupdf
+    import pymupdf4llm
+except ImportError:
+    _logger.debug("pymupdf4llm is not installed: PDF CVs will not be converted to Markdown.")
+    pymupdf4llm = None
+
+try:
+    import pdfplumber
+except ImportError:
+    _logger.debug("pdfplumber is not installed: PDF CVs will be sent to OpenAI as files.")
+    pdfplumber = None
+
+# Bump whenever the extraction prompt or the CVExtraction model changes,
+# so that cached results produced by an older version are not reused.
+OPENAI_CV_EXTRACTION_PROMPT_VERSION = '1'
+
+# Number of applicants processed by a single queue job when the
+# extraction is launched on several applicants at once.
+OPENAI_EXTRACTION_BATCH_SIZE = 20
+
+# Default maximum number of concurrent OpenAI calls within a batch job,
+# kept within the OpenAI API rate limits. It can be changed with the
+# 'openai.cv.concurrency' system parameter.
+OPENAI_MAX_CONCURRENT_CALLS = 8
+
+# Precompiled patterns used when writing the extracted data
+_LINKEDIN_URL_RE = re.compile(r'(https?://(?:www\.)?linkedin\.com/[^\s)\]]+)')
+# Skill level in the "Name (Progress%)" format, e.g. "Advanced (80%)"
+_SKILL_LEVEL_RE = re.compile(r"(.+?)\s*\((\d+)%\)")
+
+# PDFs whose text layer is shorter than this (e.g. scanned CVs) are
+# sent to OpenAI as files instead of as extracted text.
+OPENAI_MIN_CV_TEXT_LENGTH = 200
+
+# CV files above this size are uploaded through the OpenAI Files API and
+# referenced by id instead of being inlined as base64 in every request.
+# Uploaded files expire after 48 hours on OpenAI's side, so they are
+# reused for a shorter time.
+OPENAI_FILE_API_MIN_SIZE = 512 * 1024
+OPENAI_FILE_API_EXPIRY_SECONDS = 48 * 3600
+OPENAI_FILE_API_REUSE_SECONDS = 24 * 3600
+
+# (api_key, checksum) -> (uploaded file id, upload time), so that retries
+# of the same CV within a worker reuse the uploaded file.
+_openai_uploaded_files = {}
+_openai_uploaded_files_lock = threading.Lock()
+
+
+def _openai_upload_file(client, checksum, cv_bytes, filename):
+    """
+    Uploads a CV file through the OpenAI Files API, or returns the id of the
+    file already uploaded for the same content.
+    """
+    key = (client.api_key, checksum)
+    with _openai_uploaded_files_lock:
+        uploaded = _openai_uploaded_files.get(key)
+        if uploaded and time.time() - uploaded[1] < OPENAI_FILE_API_REUSE_SECONDS:
+            return uploaded[0]
+    file_id = client.files.create(
+        file=(filename, cv_bytes),
+        purpose='user_data',
+        expires_after={
+            'anchor': 'created_at',
+            'seconds': OPENAI_FILE_API_EXPIRY_SECONDS,
+        },
+    ).id
+    with _openai_uploaded_files_lock:
+        if len(_openai_uploaded_files) >= 256:
+            _openai_uploaded_files.clear()
+        _openai_uploaded_files[key] = (file_id, time.time())
+    return file_id
+
+
+@functools.lru_cache(maxsize=8)
+def _get_openai_client(api_key):
+    """
+    Returns an OpenAI client for the given API key. Clients are cached per
+    worker process, so their HTTP connection pool (and its open TLS
+    connections) is reused across calls and jobs instead of being created
+    for every call. Clients are thread-safe, so the concurrent calls of a
+    batch job share one.
+    """
+    return openai.OpenAI(api_key=api_key)
+
+
+def _openai_parse_response(client, request):
+    """
+    Calls `responses.parse` and returns the parsed response. This only does
+    network I/O, no ORM access, so it can run outside the job's thread.
+    The SDK itself retries rate-limited and server-side errors.
+
+    The response is constrained to the JSON schema of the requested
+    pydantic model and validated by the SDK, so no text parsing is needed.
+    """
+    response = client.responses.parse(**request)
+    if response.usage and _logger.isEnabledFor(logging.DEBUG):
+        _logger.debug(
+            "OpenAI usage: %s input tokens, %s cached.",
+            response.usage.input_tokens,
+            response.usage.input_tokens_details.cached_tokens
+        )
+    # `output_parsed` skips non-message items, such as the reasoning
+    # item that reasoning models return before the message.
+    if response.output_parsed is None:
+        raise ValueError(
+            "OpenAI returned no structured output: %s" % response.output_text
+        )
+    return response.output_parsed
+
+
+async def _openai_parse_all(calls, max_concurrency=OPENAI_MAX_CONCURRENT_CALLS):
+    """
+    Runs the `(client, request)` OpenAI calls concurrently, at most
+    `max_concurrency` at a time.
+
+    Returns:
+        list: The parsed response, or the raised exception, of each call,
+              in the order of `calls`.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def parse(client, request):
+        async with semaphore:
+            return await asyncio.to_thread(
+                _openai_parse_response, client, request
+            )
+
+    return await asyncio.gather(
+        *(parse(client, request) for client, request in calls),
+        return_exceptions=True,
+    )
+
 
 # --- Pydantic Models for CV Extraction ---
 
@@ -199,9 +338,15 @@ class HrApplicant(models.Model):
                  'openai_extract_state',
                  'company_id.openai_cv_extract_mode')
     def _compute_can_extract_with_openai(self):
+        # Read the extract mode once per company, not once per applicant
+        companies = self.company_id | self.env.company
+        manual_company_ids = {
+            company.id for company in companies
+            if company.openai_cv_extract_mode == 'manual_send'
+        }
         for applicant in self:
-            company = applicant.company_id or self.env.company
-            is_manual_mode = company.openai_cv_extract_mode == 'manual_send'
+            company_id = applicant.company_id.id or self.env.company.id
+            is_manual_mode = company_id in manual_company_ids
             can_retry = applicant.openai_extract_state in (
                 'no_extract', 'error', 'done'
             )
@@ -267,9 +412,20 @@ class HrApplicant(models.Model):
             'openai_extract_status': _('Pending: Queued for extraction...'),
         })
 
+        # One job per chunk of applicants instead of one job each
         user_id = self.env.user.id
-        for applicant in applicants_to_process:
-            applicant.with_delay()._run_openai_extraction_job(user_id)
+        if len(applicants_to_process) == 1:
+            applicants_to_process.with_delay()._run_openai_extraction_job(
+                user_id
+            )
+        else:
+            for start in range(
+                0, len(applicants_to_process), OPENAI_EXTRACTION_BATCH_SIZE
+            ):
+                batch = applicants_to_process[
+                    start:start + OPENAI_EXTRACTION_BATCH_SIZE
+                ]
+                batch.with_delay()._run_openai_batch_extraction_job(user_id)
 
         return {
             'type': 'ir.actions.client',
@@ -351,7 +507,22 @@ class HrApplicant(models.Model):
         }
 
     @api.model
-    def _notify_user(self, user_id, params):
+    def _notify_user(self, user_id, params, new_cursor=True):
+        """
+        Sends a notification to a specific user.
+
+        With `new_cursor=False` the notification is sent within the job's
+        own transaction and delivered when queue_job commits it, which
+        avoids opening and committing an extra transaction. Use it only when
+        the job's transaction is not rolled back afterwards.
+        """
+        if not new_cursor:
+            user = self.env['res.users'].browse(user_id)
+            if user.partner_id:
+                self.env['bus.bus']._sendone(
+                    user.partner_id, 'simple_notification', params
+                )
+            return
         try:
             with odoo.registry(self.env.cr.dbname).cursor() as notify_cr:
                 notify_env = api.Environment(
@@ -384,45 +555,34 @@ class HrApplicant(models.Model):
                 )
                 applicant.write({
                     'openai_extract_state': 'processing',
-                    'openai_extract_status': _(
-                        'Processing: Calling OpenAI API...'
-                    ),
+                    'openai_extract_status': _('Processing: Calling OpenAI API...'),
                 })
 
-                response_model = self.env['hr.applicant']._openai_call(
-                    applicant.message_main_attachment_id,
-                    prompt=OPENAI_CV_EXTRACTION_PROMPT,
-                    text_format=CVExtraction
+                # Call the API, or reuse a cached result for an identical CV
+                extracted_data = self.env['hr.applicant']._openai_extract_cv_data(
+                    applicant.message_main_attachment_id
                 )
 
-                applicant.write({
-                    'openai_extract_status': _(
-                        'Processing: Converting response...'
-                    )
-                })
-                extracted_data = response_model.model_dump(mode='json')
-
                 skill_status_message = applicant._process_extracted_cv_data(
                     extracted_data
                 )
-
-            applicant.write({
-                'openai_extract_state': 'done',
-                'openai_extract_status': skill_status_message,
-            })
+                applicant.write({
+                    'openai_extract_state': 'done',
+                    'openai_extract_status': skill_status_message,
+                })
             success = True
 
         except Exception as e:
             _logger.error(
                 "OpenAI extraction failed: %s", str(e), exc_info=True
             )
-            self.env.cr.rollback()
+            # The savepoint already rolled back the partial changes; the
+            # error state is committed with the job by queue_job.
             error_message = _("Error: %s", str(e))
             applicant.write({
                 'openai_extract_state': 'error',
                 'openai_extract_status': error_message,
             })
-            self.env.cr.commit()
             success = False
 
         finally:
@@ -444,7 +604,167 @@ class HrApplicant(models.Model):
                 }
 
             if params:
-                self._notify_user(user_id, params)
+                # Failures are confined to the savepoint, so the job's own
+                # transaction is committed by queue_job and carries the
+                # notification, together with the final state.
+                self._notify_user(user_id, params, new_cursor=False)
+
+    def _run_openai_batch_extraction_job(self, user_id):
+        """
+        Processes the extraction for a chunk of applicants in a single job
+        and notifies the user once at the end.
+
+        The OpenAI calls of the chunk run concurrently. Everything touching
+        the database (reading the CVs and writing the results) stays in the
+        job's thread, as the ORM is not thread-safe. Each applicant is
+        written in its own savepoint, so one failure does not roll back
+        the others. Final states are written once per resulting status
+        instead of once per applicant.
+        """
+        applicants = self.exists()
+        # Load the CV metadata of the chunk in one query; the file contents
+        # are only read for the CVs actually sent to OpenAI.
+        applicants.message_main_attachment_id.fetch(
+            ['name', 'mimetype', 'checksum', 'file_size', 'company_id']
+        )
+        applicants.write({
+            'openai_extract_state': 'processing',
+            'openai_extract_status': _('Processing: Calling OpenAI API...'),
+        })
+        done_ids_by_status = defaultdict(list)
+        error_ids_by_status = defaultdict(list)
+        errors = []
+
+        def add_error(applicant, error):
+            _logger.error(
+                "OpenAI extraction for applicant %s failed: %s",
+                applicant.id, str(error), exc_info=error
+            )
+            error_ids_by_status[_("Error: %s", str(error))].append(
+                applicant.id
+            )
+            errors.append(f"{applicant.name}: {str(error)}")
+
+        try:
+            # Anything failing outside of the applicants' own savepoints
+            # rolls back the whole chunk, which is then marked as failed.
+            with self.env.cr.savepoint():
+                # 1. Serve cached CVs and prepare the OpenAI call of others
+                ApplicantEnv = self.env['hr.applicant']
+                extracted_data_by_applicant = {}
+                pending_calls = []
+                for applicant in applicants:
+                    try:
+                        extracted_data = ApplicantEnv._openai_get_cached_cv_data(
+                            applicant.message_main_attachment_id
+                        )
+                        if extracted_data:
+                            extracted_data_by_applicant[applicant] = (
+                                extracted_data
+                            )
+                            continue
+                        pending_calls.append((
+                            applicant,
+                            ApplicantEnv._openai_prepare_call(
+                                applicant.message_main_attachment_id,
+                                prompt=OPENAI_CV_EXTRACTION_PROMPT,
+                                text_format=CVExtraction
+                            ),
+                        ))
+                    except Exception as e:
+                        add_error(applicant, e)
+
+                # 2. Call OpenAI concurrently; responses keep the order of
+                # the calls
+                responses = asyncio.run(_openai_parse_all(
+                    [call for _applicant, call in pending_calls],
+                    max_concurrency=self._openai_get_max_concurrency()
+                )) if pending_calls else []
+
+                for (applicant, _call), response in zip(
+                    pending_calls, responses
+                ):
+                    if isinstance(response, Exception):
+                        add_error(applicant, UserError(_(
+                            "OpenAI API call failed: %s", str(response)
+                        )))
+                        continue
+                    extracted_data = response.model_dump(mode='json')
+                    ApplicantEnv._openai_store_cv_data(
+                        applicant.message_main_attachment_id, extracted_data
+                    )
+                    extracted_data_by_applicant[applicant] = extracted_data
+
+                # 3. Write the extracted data of each applicant
+                for applicant in applicants.filtered(
+                    lambda a: a in extracted_data_by_applicant
+                ):
+                    try:
+                        with self.env.cr.savepoint():
+                            skill_status_message = (
+                                applicant._process_extracted_cv_data(
+                                    extracted_data_by_applicant[applicant]
+                                )
+                            )
+                        done_ids_by_status[skill_status_message].append(
+                            applicant.id
+                        )
+                    except Exception as e:
+                        add_error(applicant, e)
+
+                for status, applicant_ids in done_ids_by_status.items():
+                    self.browse(applicant_ids).write({
+                        'openai_extract_state': 'done',
+                        'openai_extract_status': status,
+                    })
+                for status, applicant_ids in error_ids_by_status.items():
+                    self.browse(applicant_ids).write({
+                        'openai_extract_state': 'error',
+                        'openai_extract_status': status,
+                    })
+
+        except Exception as e:
+            _logger.error(
+                "Critical error during the OpenAI batch extraction: %s",
+                str(e), exc_info=True
+            )
+            done_ids_by_status.clear()
+            errors.append(_("Critical Job Failure: %s", str(e)))
+            try:
+                applicants.write({
+                    'openai_extract_state': 'error',
+                    'openai_extract_status': _("Error: %s", str(e)),
+                })
+            except Exception as e_state:
+                _logger.error(
+                    "Failed to write the error state of applicants %s: %s",
+                    applicants.ids, str(e_state), exc_info=True
+                )
+
+        finally:
+            success_count = sum(
+                len(applicant_ids)
+                for applicant_ids in done_ids_by_status.values()
+            )
+            message = _(
+                "OpenAI CV extraction finished.\n"
+                "Processed %s CVs: %s extracted, %s failed.",
+                len(applicants), success_count,
+                len(applicants) - success_count
+            )
+            if errors:
+                message += _("\nErrors:\n- ") + "\n- ".join(errors)
+            # Failures were rolled back to their savepoints, so the job's
+            # own transaction is committed and carries the notification.
+            self._notify_user(user_id, {
+                'title': (
+                    _('Processing Complete') if not errors
+                    else _('Processing Finished with Errors')
+                ),
+                'message': message,
+                'type': 'success' if not errors else 'warning',
+                'sticky': bool(errors),
+            }, new_cursor=False)
 
     # --- Background Job: AI Match ---
 
@@ -559,7 +879,9 @@ class HrApplicant(models.Model):
                     'sticky': True
                 }
             if params:
-                self._notify_user(user_id, params)
+                # On success the job's own transaction is committed by
+                # queue_job and carries the notification.
+                self._notify_user(user_id, params, new_cursor=not success)
 
     def _run_ai_match_job_single(self, user_id):
         self.ensure_one()
@@ -605,7 +927,7 @@ class HrApplicant(models.Model):
         """
         Executes the multi-step matching process:
         1. Split requirements by category (Hard Skill, Soft Skill, etc.)
-        2. Call OpenAI for each category.
+        2. Call OpenAI for each category, concurrently.
         3. Aggregate results and call OpenAI for a final summary.
         """
         self.ensure_one()
@@ -639,6 +961,8 @@ class HrApplicant(models.Model):
 
             all_statement_matches = []
             analysis_notes = []
+            # The requirements are already loaded: no browse per match
+            req_name_by_id = {r.id: r.name for r in all_reqs}
 
             categories = [
                 'Hard Skills',
@@ -647,16 +971,12 @@ class HrApplicant(models.Model):
                 'Operational'
             ]
 
+            # Build the prompt of each category with requirements
+            category_prompts = []
             for category in categories:
                 reqs = reqs_by_category.get(category)
                 if not reqs:
                     continue
-
-                self.write({
-                    'ai_match_status': _(
-                        'Processing (Multi): Analyzing %s...', category
-                    )
-                })
                 job_data = [{
                     'id': r.id,
                     'name': r.name,
@@ -665,16 +985,49 @@ class HrApplicant(models.Model):
                         p.name for p in r.company_relevance_ids
                     ]
                 } for r in reqs]
+                category_prompts.append((
+                    category,
+                    AI_MATCH_MULTI_PROMPT_TEMPLATE.format(
+                        category_name=category,
+                        job_requirements_json=json.dumps(job_data, indent=2)
+                    ),
+                ))
 
-                prompt = AI_MATCH_MULTI_PROMPT_TEMPLATE.format(
-                    category_name=category,
-                    job_requirements_json=json.dumps(job_data, indent=2)
-                )
-                response = self.env['hr.applicant']._openai_call(
+            # Analyze the categories concurrently. The CV is read once and
+            # shared by the requests, which only differ by their prompt.
+            responses = []
+            if category_prompts:
+                self.write({
+                    'ai_match_status': _(
+                        'Processing (Multi): Analyzing categories...'
+                    )
+                })
+                client, request = self.env['hr.applicant']._openai_prepare_call(
                     self.message_main_attachment_id,
-                    prompt=prompt,
+                    prompt=category_prompts[0][1],
                     text_format=AIMultiMatch
                 )
+                user_message = request['input'][1]
+                responses = asyncio.run(_openai_parse_all([
+                    (client, dict(request, input=[
+                        {"role": "system", "content": prompt},
+                        user_message,
+                    ]))
+                    for _category, prompt in category_prompts
+                ], max_concurrency=min(
+                    len(category_prompts),
+                    self.env['hr.applicant']._openai_get_max_concurrency()
+                )))
+
+            for (category, _prompt), response in zip(category_prompts, responses):
+                if isinstance(response, Exception):
+                    _logger.error(
+                        "OpenAI API call failed: %s", str(response),
+                        exc_info=response
+                    )
+                    raise UserError(_(
+                        "OpenAI API call failed: %s", str(response)
+                    ))
 
                 matches = response.model_dump(mode='json').get(
                     'statement_matches', []
@@ -682,12 +1035,11 @@ class HrApplicant(models.Model):
                 all_statement_matches.extend(matches)
 
                 for m in matches:
-                    req_record = self.env['hr.job.requirement'].browse(
-                        m.get('requirement_id')
-                    )
                     analysis_notes.append({
                         'category': category,
-                        'requirement': req_record.name,
+                        'requirement': req_name_by_id.get(
+                            m.get('requirement_id'), ''
+                        ),
                         'fit': m.get('match_fit'),
                         'explanation': m.get('explanation')
                     })
@@ -718,7 +1070,7 @@ class HrApplicant(models.Model):
     # --- Helpers ---
 
     @api.model
-    def _openai_get_client(self, company_id=None):
+    def _openai_get_config(self, company_id=None):
         company = (
             self.env['res.company'].browse(company_id)
             if company_id else self.env.company
@@ -729,60 +1081,213 @@ class HrApplicant(models.Model):
             raise UserError(_("OpenAI API Key is not set."))
         if not model:
             raise UserError(_("OpenAI Model is not set."))
-        return openai.OpenAI(api_key=api_key), model
+        return api_key, model
 
     @api.model
-    def _openai_call(self, attachment, prompt, text_format):
+    def _openai_get_max_concurrency(self):
+        """
+        Returns:
+            int: The maximum number of concurrent OpenAI calls, set by the
+                 'openai.cv.concurrency' system parameter.
+        """
+        max_concurrency = int(self.env['ir.config_parameter'].sudo().get_param(
+            'openai.cv.concurrency', OPENAI_MAX_CONCURRENT_CALLS
+        ))
+        return max(max_concurrency, 1)
+
+    @api.model
+    def _openai_get_client(self, company_id=None):
+        api_key, model = self._openai_get_config(company_id)
+        return _get_openai_client(api_key), model
+
+    @api.model
+    def _openai_prepare_call(self, attachment, prompt, text_format):
+        """
+        Reads the configuration and the attachment needed to call OpenAI.
+
+        Returns:
+            tuple: The OpenAI client and the arguments of `responses.parse`.
+        """
         company = attachment.company_id or self.env.company
         client, model_name = self._openai_get_client(company.id)
 
-        if not attachment or not attachment.datas:
+        # Check the stored size: reading `datas` here would base64-encode
+        # the whole file even when it is uploaded rather than inlined.
+        if not attachment or not attachment.file_size:
             raise UserError(_("CV is empty: %s", attachment.name))
 
-        base64_string = attachment.datas.decode('utf-8')
-        file_data_uri = f"data:{attachment.mimetype};base64,{base64_string}"
+        # Send the text of PDFs rather than the file itself: it is much
+        # smaller on the wire and costs far fewer input tokens.
+        cv_text = None
+        if attachment.mimetype == 'application/pdf':
+            cv_text = self._extract_text_from_pdf(attachment.raw)
+
+        if cv_text:
+            user_content = [{"type": "input_text", "text": cv_text}]
+        else:
+            user_content = [
+                self._openai_prepare_file_content(client, attachment),
+                {"type": "input_text", "text": "Analyze the attached file."}
+            ]
 
-        user_content = [
-            {
-                "type": "input_file",
-                "filename": attachment.name,
-                "file_data": file_data_uri
-            },
-            {"type": "input_text", "text": "Analyze the attached file."}
-        ]
+        _logger.info(
+            "Calling OpenAI (parse) model '%s' for %s",
+            model_name, attachment.name
+        )
+        # The prompt comes first and the CV last, so requests sharing a
+        # prompt share a prefix that OpenAI can serve from its prompt cache.
+        # The cache key routes them to the same cache.
+        return client, {
+            'model': model_name,
+            'input': [
+                {"role": "system", "content": prompt},
+                {"role": "user", "content": user_content}
+            ],
+            'text_format': text_format,
+            'temperature': 0,
+            'prompt_cache_key': f"hr_recruitment_extract_openai.{text_format.__name__}",
+        }
+
+    @api.model
+    def _openai_prepare_file_content(self, client, attachment):
+        """
+        Returns:
+            dict: The `input_file` content sending the CV file to OpenAI.
+        """
+        if attachment.file_size > OPENAI_FILE_API_MIN_SIZE and attachment.checksum:
+            # Large files are uploaded once and referenced by id
+            try:
+                return {
+                    "type": "input_file",
+                    "file_id": _openai_upload_file(
+                        client, attachment.checksum,
+                        attachment.raw, attachment.name
+                    ),
+                }
+            except Exception as e:
+                _logger.warning(
+                    "Failed to upload CV %s to OpenAI, sending it inline: %s",
+                    attachment.name, str(e)
+                )
+        # `datas` is already base64, which is plain ASCII
+        base64_string = attachment.datas.decode('ascii')
+        return {
+            "type": "input_file",
+            "filename": attachment.name,
+            "file_data": f"data:{attachment.mimetype};base64,{base64_string}"
+        }
+
+    @api.model
+    def _extract_text_from_pdf(self, cv_bytes):
+        """
+        Extracts the text of a PDF CV locally.
+
+        With pymupdf4llm the text is returned as Markdown, which keeps the
+        headings and bullet lists of the CV in fewer tokens than plain text.
+        Otherwise pdfplumber's plain text is used, pages separated by form feeds.
 
+        Returns:
+            str: The CV text, or None if it could not be extracted or is too
+                 short to be usable (e.g. a scanned CV), in which case the
+                 file itself should be sent.
+        """
+        if not (pymupdf4llm or pdfplumber) or not cv_bytes or not cv_bytes.startswith(b'%PDF'):
+            return None
         try:
-            _logger.info(
-                "Calling OpenAI (parse) model '%s' for %s",
-                model_name, attachment.name
-            )
-            response = client.responses.parse(
-                model=model_name,
-                input=[
-                    {"role": "system", "content": prompt},
-                    {"role": "user", "content": user_content}
-                ],
-                text_format=text_format,
-                temperature=0,
-            )
-            return response.output[0].content[0].parsed
+            if pymupdf4llm:
+                with pymupdf.open(stream=cv_bytes, filetype='pdf') as doc:
+                    cv_text = pymupdf4llm.to_markdown(doc).strip()
+            else:
+                with pdfplumber.open(io.BytesIO(cv_bytes)) as pdf:
+                    cv_text = '\f'.join(page.extract_text() or '' for page in pdf.pages).strip()
+        except Exception as e:
+            _logger.warning("Failed to extract text from PDF CV, sending the file instead: %s", str(e))
+            return None
+        if len(cv_text) < OPENAI_MIN_CV_TEXT_LENGTH:
+            return None
+        return cv_text
+
+    @api.model
+    def _openai_call(self, attachment, prompt, text_format):
+        client, request = self._openai_prepare_call(
+            attachment, prompt, text_format
+        )
+        try:
+            return _openai_parse_response(client, request)
         except Exception as e:
             _logger.error("OpenAI API call failed: %s", str(e), exc_info=True)
             raise UserError(_("OpenAI API call failed: %s", str(e)))
 
+    @api.model
+    def _openai_extract_cv_data(self, attachment):
+        """
+        Returns the extracted data of a CV attachment, as a dict.
+
+        Results are cached by the attachment checksum (the SHA-1 of the
+        content, already computed by Odoo), the OpenAI model and the prompt
+        version, so a CV that was already extracted is not sent to the
+        OpenAI API again.
+        """
+        extracted_data = self._openai_get_cached_cv_data(attachment)
+        if extracted_data:
+            return extracted_data
+
+        response_model = self._openai_call(
+            attachment,
+            prompt=OPENAI_CV_EXTRACTION_PROMPT,
+            text_format=CVExtraction
+        )
+        extracted_data = response_model.model_dump(mode='json')
+        self._openai_store_cv_data(attachment, extracted_data)
+        return extracted_data
+
+    @api.model
+    def _openai_get_cached_cv_data(self, attachment):
+        """
+        Returns:
+            dict: The cached extraction data of the CV attachment, or None.
+        """
+        if not attachment:
+            raise UserError(_("No attachment provided."))
+        if not attachment.checksum:
+            return None
+
+        company = attachment.company_id or self.env.company
+        model_name = self._openai_get_config(company.id)[1]
+        extracted_data = self.env['hr.applicant.openai.cache'].sudo()._get_cached_result(
+            attachment.checksum, model_name, OPENAI_CV_EXTRACTION_PROMPT_VERSION
+        )
+        if extracted_data:
+            _logger.info(
+                "Using cached OpenAI extraction for attachment %s.",
+                attachment.name
+            )
+        return extracted_data
+
+    @api.model
+    def _openai_store_cv_data(self, attachment, extracted_data):
+        """
+        Caches the extraction data of a CV attachment.
+        """
+        if not attachment.checksum:
+            return
+        company = attachment.company_id or self.env.company
+        model_name = self._openai_get_config(company.id)[1]
+        self.env['hr.applicant.openai.cache'].sudo()._store_result(
+            attachment.checksum, model_name,
+            OPENAI_CV_EXTRACTION_PROMPT_VERSION, extracted_data
+        )
+
     def _process_extracted_cv_data(self, extracted_data):
         self.ensure_one()
         status = _('Successfully extracted data.')
-        skills_list = []
+        # 'hr_recruitment_skills' is a dependency of this module, so its
+        # models are always there: no need to query the module state.
+        skills_list = extracted_data.get('skills')
 
         try:
             with self.env.cr.savepoint():
                 self._write_extracted_data(extracted_data)
-                if (extracted_data.get('skills') and
-                        self.env['ir.module.module']._get(
-                            'hr_recruitment_skills'
-                        ).state == 'installed'):
-                    skills_list = extracted_data.get('skills')
         except Exception as e:
             _logger.error("Failed to write simple data: %s", str(e))
             raise UserError(_("Failed to write simple data: %s", str(e)))
@@ -811,10 +1316,7 @@ class HrApplicant(models.Model):
         if data.get('phone'):
             vals['partner_phone'] = data['phone']
         if data.get('linkedin'):
-            match = re.search(
-                r'(https?://(?:www\.)?linkedin\.com/[^\s)\]]+)',
-                str(data['linkedin'])
-            )
+            match = _LINKEDIN_URL_RE.search(str(data['linkedin']))
             vals['linkedin_profile'] = (
                 match.group(1) if match else str(data['linkedin']).strip()
             )
@@ -834,87 +1336,305 @@ class HrApplicant(models.Model):
         if vals:
             self.write(vals)
 
+    @api.model
+    def _openai_search_by_names(self, model_env, names):
+        """
+        Returns the records of `model_env` whose name matches one of `names`
+        (case-insensitive).
+
+        Exact matches are fetched first with a plain `in` domain. Only the
+        names not found that way are looked up with one combined `=ilike`
+        query, which is usually not needed at all.
+        """
+        if not names:
+            return model_env.browse()
+        records = model_env.search([('name', 'in', list(names))])
+        found_names = {name.lower() for name in records.mapped('name')}
+        missing_names = [
+            name for name in names if name.lower() not in found_names
+        ]
+        if missing_names:
+            records |= model_env.search(expression.OR([
+                [('name', '=ilike', name)] for name in missing_names
+            ]))
+        return records
+
+    @api.model
+    def _openai_records_by_name(self, model_env, names):
+        """
+        Returns:
+            dict: lowercased name -> first record of `model_env` matching it.
+        """
+        records_by_name = {}
+        for record in self._openai_search_by_names(model_env, names):
+            records_by_name.setdefault(record.name.lower(), record)
+        return records_by_name
+
+    @api.model
+    @tools.ormcache()
+    def _search_default_skill_level_id(self):
+        """
+        Finds the 'Beginner' skill level used when a skill level is not
+        provided or recognized.
+
+        The result is cached in the registry, so the lookup runs once per
+        worker instead of once per applicant. Only levels found by the search
+        are cached: a level created by `_get_default_skill_level` may still be
+        rolled back with its transaction.
+
+        Returns:
+            int: The ID of the default skill level record, or False.
+        """
+        return self.env['hr.skill.level'].search(
+            [('name', '=ilike', 'Beginner')], limit=1
+        ).id
+
+    def _get_default_skill_level(self):
+        """
+        Returns:
+            hr.skill.level: The default skill level record, created if it
+                            does not exist yet.
+        """
+        skill_level_env = self.env['hr.skill.level']
+        default_level = skill_level_env.browse(self._search_default_skill_level_id())
+        if not default_level.exists():
+            # Nothing was found, or the cached level was deleted since: only
+            # drop this method's cache entry and search again.
+            cache = type(self)._search_default_skill_level_id.__cache__
+            entries, key, _counter = cache.lru(self)
+            try:
+                del entries[key + cache.key(self)]
+            except KeyError:
+                pass
+            default_level = skill_level_env.browse(self._search_default_skill_level_id())
+        if not default_level.exists():
+            default_level = skill_level_env.create({
+                'name': 'Beginner', 'level_progress': 15
+            })
+        return default_level
+
+    @api.model
+    def _openai_create_records(self, model_env, vals_list):
+        """
+        Creates the records of `vals_list` with one `create` call. If that
+        fails, they are created one by one, each in its own savepoint, so
+        that one invalid entry does not prevent creating the others.
+
+        Returns:
+            list: The created record, or None if its creation failed, for
+                  each values of `vals_list`.
+        """
+        if not vals_list:
+            return []
+        try:
+            with self.env.cr.savepoint():
+                return list(model_env.create(vals_list))
+        except Exception as e:
+            _logger.warning(
+                "Failed to create %s records at once, creating them one by "
+                "one: %s", model_env._name, str(e)
+            )
+        records = []
+        for vals in vals_list:
+            try:
+                with self.env.cr.savepoint():
+                    records.append(model_env.create(vals))
+            except Exception as e:
+                _logger.error(
+                    "Failed to create %s %s: %s", model_env._name, vals, str(e)
+                )
+                records.append(None)
+        return records
+
     def _process_skills(self, skills_list):
+        """
+        Finds or creates the Skill Types, Skill Levels and Skills of the
+        extracted skills, then links them to the applicant.
+
+        All referenced types, levels, skills and existing applicant-skill
+        links are prefetched up front, and the missing ones are created
+        with one `create` call per model. A skill is matched by name within
+        its type first; a same-named skill of another type is only moved to
+        the type when the type has no such skill. An invalid skill entry is
+        logged and skipped without affecting the others.
+        """
         self.ensure_one()
         skill_type_env = self.env['hr.skill.type']
         skill_level_env = self.env['hr.skill.level']
         skill_env = self.env['hr.skill']
+        applicant_skill_env = self.env['hr.applicant.skill']
 
-        default_level = None
-
+        # 1. Collect the valid items and the names they reference
+        items = []
         for item in skills_list:
             if not isinstance(item, dict):
                 continue
             s_name = item.get('skill')
-            s_type = item.get('type', 'General')
+            s_type = item.get('type') or 'General'
             s_level = item.get('level')
             if not s_name:
                 continue
+            match = _SKILL_LEVEL_RE.match(s_level) if s_level else None
+            level_parsed = (
+                (match.group(1).strip(), int(match.group(2)))
+                if match else None
+            )
+            items.append((s_name, s_type, s_level, level_parsed))
+
+        if not items:
+            return
+
+        level_names = set()
+        for _name, _type, s_level, level_parsed in items:
+            if s_level:
+                level_names.add(s_level)
+            if level_parsed:
+                level_names.add(level_parsed[0])
+
+        # 2. Prefetch the existing records by name, skills by name and type
+        type_by_name = self._openai_records_by_name(
+            skill_type_env, {item[1] for item in items}
+        )
+        skill_by_name = {}
+        skill_by_name_type = {}
+        for sk in self._openai_search_by_names(
+            skill_env, {item[0] for item in items}
+        ):
+            skill_by_name.setdefault(sk.name.lower(), sk)
+            skill_by_name_type.setdefault(
+                (sk.name.lower(), sk.skill_type_id.id), sk
+            )
+        level_by_name = {}
+        level_by_name_progress = {}
+        for level in self._openai_search_by_names(skill_level_env, level_names):
+            level_by_name.setdefault(level.name.lower(), level)
+            level_by_name_progress.setdefault(
+                (level.name.lower(), level.level_progress), level
+            )
 
+        # 3. Create the missing types and levels, one call each
+        missing_types = {}
+        missing_levels = {}
+        for _name, s_type, _level, level_parsed in items:
+            if s_type.lower() not in type_by_name:
+                missing_types.setdefault(s_type.lower(), s_type)
+            if level_parsed:
+                key = (level_parsed[0].lower(), level_parsed[1])
+                if key not in level_by_name_progress:
+                    missing_levels.setdefault(key, level_parsed)
+
+        for key, st in zip(missing_types, self._openai_create_records(
+            skill_type_env, [{'name': name} for name in missing_types.values()]
+        )):
+            if st:
+                type_by_name[key] = st
+        for key, sl in zip(missing_levels, self._openai_create_records(
+            skill_level_env, [
+                {'name': name, 'level_progress': progress}
+                for name, progress in missing_levels.values()
+            ]
+        )):
+            if sl:
+                level_by_name_progress[key] = sl
+
+        # 4. Find the skill of each item within its type. Otherwise move a
+        # same-named skill of another type, or create the skill (in one call)
+        requested_keys = {
+            (s_name.lower(), type_by_name[s_type.lower()].id)
+            for s_name, s_type, _level, _parsed in items
+            if s_type.lower() in type_by_name
+        }
+        missing_skills = {}
+        for s_name, s_type, _level, _parsed in items:
+            st = type_by_name.get(s_type.lower())
+            if not st:
+                continue
+            key = (s_name.lower(), st.id)
+            if key in skill_by_name_type or key in missing_skills:
+                continue
+            sk = skill_by_name.pop(s_name.lower(), None)
+            old_key = sk and (s_name.lower(), sk.skill_type_id.id)
+            if not sk or old_key in requested_keys:
+                # Another item uses the skill with its current type
+                missing_skills[key] = {'name': s_name, 'skill_type_id': st.id}
+                continue
             try:
-                st = skill_type_env.search(
-                    [('name', '=ilike', s_type)], limit=1
-                ) or skill_type_env.create({'name': s_type})
-
-                sl = None
-                if s_level:
-                    match = re.match(r"(.+?)\s*\((\d+)%\)", s_level)
-                    if match:
-                        sl = skill_level_env.search([
-                            ('name', '=ilike', match.group(1).strip()),
-                            ('level_progress', '=', int(match.group(2)))
-                        ], limit=1)
-                        if not sl:
-                            sl = skill_level_env.create({
-                                'name': match.group(1).strip(),
-                                'level_progress': int(match.group(2))
-                            })
-                    if not sl:
-                        sl = skill_level_env.search(
-                            [('name', '=ilike', s_level)], limit=1
-                        )
+                with self.env.cr.savepoint():
+                    sk.write({'skill_type_id': st.id})
+                skill_by_name_type.pop(old_key, None)
+                skill_by_name_type[key] = sk
+            except Exception as e:
+                _logger.error(
+                    "Failed to set the type of skill %s to %s: %s",
+                    sk.name, st.name, str(e)
+                )
+
+        for key, sk in zip(missing_skills, self._openai_create_records(
+            skill_env, list(missing_skills.values())
+        )):
+            if sk:
+                skill_by_name_type[key] = sk
 
-                if not sl:
-                    if not default_level:
-                        default_level = skill_level_env.search(
-                            [('name', '=ilike', 'Beginner')], limit=1
-                        ) or skill_level_env.create({
-                            'name': 'Beginner', 'level_progress': 15
-                        })
-                    sl = default_level
-
-                if sl not in st.skill_level_ids:
-                    st.write({'skill_level_ids': [(4, sl.id)]})
-
-                sk = skill_env.search(
-                    [('name', '=ilike', s_name), ('skill_type_id', '=', st.id)],
-                    limit=1
+        # 5. Resolve the level of each item
+        default_level = None
+        type_to_levels = defaultdict(set)
+        resolved = []
+        for s_name, s_type, s_level, level_parsed in items:
+            st = type_by_name.get(s_type.lower())
+            sk = st and skill_by_name_type.get((s_name.lower(), st.id))
+            if not sk:
+                _logger.warning(
+                    "Skipping skill %s (%s) of applicant %s: it could not "
+                    "be found or created.", s_name, s_type, self.id
                 )
-                if not sk:
-                    sk = skill_env.search(
-                        [('name', '=ilike', s_name)], limit=1
-                    )
-                    if sk:
-                        sk.write({'skill_type_id': st.id})
-                    else:
-                        sk = skill_env.create({
-                            'name': s_name,
-                            'skill_type_id': st.id
-                        })
-
-                if not self.env['hr.applicant.skill'].search([
-                    ('applicant_id', '=', self.id),
-                    ('skill_id', '=', sk.id)
-                ], limit=1):
-                    self.env['hr.applicant.skill'].create({
-                        'applicant_id': self.id,
-                        'skill_id': sk.id,
-                        'skill_level_id': sl.id,
-                        'skill_type_id': st.id
+                continue
+            sl = None
+            if level_parsed:
+                sl = level_by_name_progress.get(
+                    (level_parsed[0].lower(), level_parsed[1])
+                )
+            if not sl and s_level:
+                sl = level_by_name.get(s_level.lower())
+            if not sl:
+                if not default_level:
+                    default_level = self._get_default_skill_level()
+                sl = default_level
+            type_to_levels[st].add(sl.id)
+            resolved.append((sk, st, sl))
+
+        # 6. Link the levels to their types, one write per type
+        for st, level_ids in type_to_levels.items():
+            new_level_ids = level_ids - set(st.skill_level_ids.ids)
+            if not new_level_ids:
+                continue
+            try:
+                with self.env.cr.savepoint():
+                    st.write({
+                        'skill_level_ids': [(4, lid) for lid in new_level_ids]
                     })
+            except Exception as e:
+                _logger.error(
+                    "Failed to link levels %s to skill type %s: %s",
+                    new_level_ids, st.name, str(e)
+                )
 
-            except Exception:
-                pass
+        # 7. Create the missing applicant-skill links in one call
+        linked_skill_ids = set(applicant_skill_env.search([
+            ('applicant_id', '=', self.id),
+            ('skill_id', 'in', [sk.id for sk, _st, _sl in resolved]),
+        ]).skill_id.ids)
+        new_links = []
+        for sk, st, sl in resolved:
+            if sk.id in linked_skill_ids:
+                continue
+            linked_skill_ids.add(sk.id)
+            new_links.append({
+                'applicant_id': self.id,
+                'skill_id': sk.id,
+                'skill_level_id': sl.id,
+                'skill_type_id': st.id
+            })
+        self._openai_create_records(applicant_skill_env, new_links)
 
     def _process_ai_match_data(self, match_data):
         self.ensure_one()
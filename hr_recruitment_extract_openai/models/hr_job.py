@@ -8,11 +8,7 @@ from odoo.exceptions import UserError
 from pydantic import BaseModel, Field
 
 # Relative imports
-from .openai_prompts import (
-    JD_EXTRACT_SINGLE_PROMPT,
-    OPENAI_CV_EXTRACTION_PROMPT,
-)
-from .hr_applicant import CVExtraction
+from .openai_prompts import JD_EXTRACT_SINGLE_PROMPT
 
 _logger = logging.getLogger(__name__)
 
@@ -555,16 +551,13 @@ class HrJob(models.Model):
                             cv_name
                         ))
 
-                    _logger.info(f"Bulk Extraction: Processing {cv_name}")
+                    _logger.info("Bulk Extraction: Processing %s", cv_name)
 
                     # Call AI
                     ApplicantEnv = work_env['hr.applicant']
-                    response_model = ApplicantEnv._openai_call(
-                        att_record,
-                        prompt=OPENAI_CV_EXTRACTION_PROMPT,
-                        text_format=CVExtraction
+                    extracted_data = ApplicantEnv._openai_extract_cv_data(
+                        att_record
                     )
-                    extracted_data = response_model.model_dump(mode='json')
 
                     # Create Applicant
                     name_part = (
@@ -604,7 +597,7 @@ class HrJob(models.Model):
             except Exception as e:
                 error_msg = str(e)
                 _logger.error(
-                    f"Extraction failed for {cv_name_for_log}: {error_msg}",
+                    "Extraction failed for %s: %s", cv_name_for_log, error_msg,
                     exc_info=True
                 )
 
@@ -633,7 +626,7 @@ class HrJob(models.Model):
                     stats_cr.commit()
             except Exception as e_stats:
                 _logger.critical(
-                    f"Stats update failed for {cv_name_for_log}: {e_stats}",
+                    "Stats update failed for %s: %s", cv_name_for_log, e_stats,
                     exc_info=True
                 )
 
@@ -676,7 +669,7 @@ class HrJob(models.Model):
                     match_cr.commit()
             except Exception as e_match_tx:
                 _logger.error(
-                    f"Match Tx failed for applicant {app_id}: {e_match_tx}",
+                    "Match Tx failed for applicant %s: %s", app_id, e_match_tx,
                     exc_info=True
                 )
                 match_fail_count += 1
@@ -804,7 +797,7 @@ class HrJob(models.Model):
                 })
                 final_cr.commit()
         except Exception as e_fin:
-            _logger.error(f"Finalize failed: {e_fin}")
+            _logger.error("Finalize failed: %s", e_fin)
 
     # --- Background Logic for JD Parsing ---
 
@@ -10,7 +10,10 @@ from odoo.tests.common import TransactionCase
 from odoo.exceptions import UserError
 
 # Import the prompt constant from the model file
-from odoo.addons.hr_recruitment_extract_openai.models.hr_applicant import OPENAI_CV_EXTRACTION_PROMPT
+from odoo.addons.hr_recruitment_extract_openai.models.hr_applicant import (
+    OPENAI_CV_EXTRACTION_PROMPT,
+    _get_openai_client,
+)
 
 # Sample successful response from OpenAI
 # This simulates the JSON data we expect the API to return.
@@ -100,6 +103,10 @@ class TestHrApplicantOpenAI(TransactionCase):
         """
         super().setUp()
 
+        # Clients are cached per process: drop them so that each test
+        # goes through the patched `openai.OpenAI` constructor.
+        _get_openai_client.cache_clear()
+
         # 1. Patch `self.env.cr.commit()` and `self.env.cr.rollback()`
         self.commit_patcher = patch('odoo.sql_db.Cursor.commit', lambda *args, **kwargs: None)
         self.commit_patcher.start()
@@ -122,7 +129,12 @@ class TestHrApplicantOpenAI(TransactionCase):
                 # Run the real method with the captured arguments
                 return real_method(*job_args, **job_kwargs)
 
+            def run_batch_job_sync(*job_args, **job_kwargs):
+                real_method = getattr(self_recordset, '_run_openai_batch_extraction_job')
+                return real_method(*job_args, **job_kwargs)
+
             mock_delay_obj._run_openai_extraction_job = MagicMock(side_effect=run_job_sync)
+            mock_delay_obj._run_openai_batch_extraction_job = MagicMock(side_effect=run_batch_job_sync)
             return mock_delay_obj
 
         self.delay_patcher = patch.object(
@@ -395,4 +407,135 @@ class TestHrApplicantOpenAI(TransactionCase):
         # 6. No attachment
         self.applicant.openai_extract_state = 'no_extract'
         self.applicant.message_main_attachment_id = False
-        self.assertFalse(self.applicant.can_extract_with_openai)
\ No newline at end of file
+        self.assertFalse(self.applicant.can_extract_with_openai)
+
+    def test_06_batch_extraction(self):
+        """
+        Test that several applicants are extracted in a single job, and that
+        a failing CV does not prevent the others from being extracted.
+        """
+        applicant_2 = self.env['hr.applicant'].create({
+            'name': "Second Applicant's Application",
+        })
+        attachment_2 = self.env['ir.attachment'].create({
+            'name': 'second_cv.pdf',
+            'datas': base64.b64encode(b'Another fake PDF content'),
+            'mimetype': 'application/pdf',
+            'res_model': 'hr.applicant',
+            'res_id': applicant_2.id,
+        })
+        applicant_2.message_main_attachment_id = attachment_2.id
+        applicants = self.applicant + applicant_2
+
+        mock_response = MagicMock()
+        mock_response.model_dump.return_value = dict(MOCK_OPENAI_RESPONSE_JSON, skills=[])
+
+        def mock_parse_response(client, request):
+            if request['input'][1]['content'][0]['filename'] == 'second_cv.pdf':
+                raise openai.BadRequestError(
+                    MOCK_OPENAI_RESPONSE_ERROR, response=MagicMock(), body=None
+                )
+            return mock_response
+
+        # The calls run in worker threads: patch the module-level function
+        with patch(
+            'odoo.addons.hr_recruitment_extract_openai.models.hr_applicant._openai_parse_response',
+            side_effect=mock_parse_response
+        ) as mock_call:
+            applicants.action_extract_with_openai()
+
+        self.assertEqual(mock_call.call_count, 2)
+        self.assertEqual(self.applicant.openai_extract_state, 'done')
+        self.assertEqual(self.applicant.partner_name, 'John Doe')
+        self.assertEqual(applicant_2.openai_extract_state, 'error')
+        self.assertIn(MOCK_OPENAI_RESPONSE_ERROR, applicant_2.openai_extract_status)
+
+        # A single notification for the whole batch
+        self.mock_bus_sendone.assert_called_once()
+        call_args = self.mock_bus_sendone.call_args[0]
+        self.assertEqual(call_args[2]['type'], 'warning')
+        self.assertIn("1 extracted, 1 failed", call_args[2]['message'])
+
+    def test_07_cached_extraction(self):
+        """
+        Test that a CV extracted once is served from the cache afterwards,
+        without calling the OpenAI API again.
+        """
+        mock_response = MagicMock()
+        mock_response.model_dump.return_value = dict(MOCK_OPENAI_RESPONSE_JSON, skills=[])
+
+        with patch(
+            'odoo.addons.hr_recruitment_extract_openai.models.hr_applicant._openai_parse_response',
+            return_value=mock_response
+        ) as mock_call:
+            self.applicant.action_extract_with_openai()
+            self.assertEqual(self.applicant.openai_extract_state, 'done')
+
+            self.applicant.write({'partner_name': False})
+            self.applicant.action_extract_with_openai()
+
+        mock_call.assert_called_once()
+        self.assertEqual(self.applicant.openai_extract_state, 'done')
+        self.assertEqual(self.applicant.partner_name, 'John Doe')
+
+    def test_08_skills_matched_within_their_type(self):
+        """
+        Test that an extracted skill is matched within its type, and that a
+        same-named skill of another type is not moved to it.
+        """
+        skill_type_prog, skill_type_other = self.env['hr.skill.type'].create([
+            {'name': 'Programming Languages'},
+            {'name': 'Reptiles'},
+        ])
+        skill_py_prog, skill_py_other = self.env['hr.skill'].create([
+            {'name': 'Python', 'skill_type_id': skill_type_prog.id},
+            {'name': 'Python', 'skill_type_id': skill_type_other.id},
+        ])
+
+        self.applicant._process_skills([
+            {"type": "Programming Languages", "skill": "Python", "level": "Advanced (80%)"},
+            # Invalid entries are skipped without affecting the others
+            "not a skill",
+            {"type": "Programming Languages", "skill": None, "level": None},
+        ])
+
+        self.assertEqual(self.applicant.applicant_skill_ids.skill_id, skill_py_prog)
+        self.assertEqual(skill_py_other.skill_type_id, skill_type_other)
+        self.assertEqual(skill_py_prog.skill_type_id, skill_type_prog)
+
+    def test_09_batch_extraction_critical_error(self):
+        """
+        Test that an unexpected error of a batch job marks its applicants
+        as failed and still notifies the user.
+        """
+        with patch(
+            'odoo.addons.hr_recruitment_extract_openai.models.hr_applicant._openai_parse_all',
+            side_effect=RuntimeError("Unexpected failure")
+        ):
+            self.applicant._run_openai_batch_extraction_job(self.env.user.id)
+
+        self.assertEqual(self.applicant.openai_extract_state, 'error')
+        self.assertIn("Unexpected failure", self.applicant.openai_extract_status)
+
+        self.mock_bus_sendone.assert_called_once()
+        call_args = self.mock_bus_sendone.call_args[0]
+        self.assertEqual(call_args[2]['type'], 'warning')
+        self.assertIn("Critical Job Failure", call_args[2]['message'])
+
+    def test_10_default_skill_level_not_found_in_cache(self):
+        """
+        Test that a deleted default skill level is found or created again
+        without clearing the whole registry cache.
+        """
+        applicant_model = self.env['hr.applicant']
+        default_level = applicant_model._get_default_skill_level()
+        self.assertEqual(default_level.name, 'Beginner')
+
+        self.env['hr.skill.level'].search([('name', '=ilike', 'Beginner')]).unlink()
+        with patch.object(type(self.env.registry), 'clear_cache') as mock_clear_cache:
+            new_level = applicant_model._get_default_skill_level()
+
+        mock_clear_cache.assert_not_called()
+        self.assertTrue(new_level.exists())
+        self.assertNotEqual(new_level, default_level)
+        self.assertEqual(new_level.name, 'Beginner')